@@ -3,9 +3,16 @@ from .base import (
     MatchedOrder,
     Direction,
 )
-from .datasets import load_msft_orders
+from .datasets import (
+    load_msft_orders,
+    load_msft_orders_arrays,
+    replay_orders,
+)
+from .arena_lob import ArrayArenaLimitOrderBook
 from .deque_lob import (
     ArrayDequeLimitOrderBook,
     BalancedTreeDequeLimitOrderBook,
     HashDequeLimitOrderBook,
+    SortedDictDequeLimitOrderBook,
 )
+from .list_lob import SortedOrderListLimitOrderBook
@@ -0,0 +1,2 @@
+from .array_arena import ArrayArenaLimitOrderBook
+from .order_arena import OrderArena
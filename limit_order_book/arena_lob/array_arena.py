@@ -0,0 +1,507 @@
+import itertools
+import numpy
+import pandas
+from typing import AnyStr, Optional, Tuple
+
+from limit_order_book.base import (
+    BaseLimitOrderBook,
+    LimitOrder,
+    MatchedOrder,
+    Direction,
+)
+
+from limit_order_book.base.bitset import next_set_bit, prev_set_bit
+
+from .kernels import (
+    _add_batch,
+    _record_matches,
+    _top_ask_levels,
+    _top_bid_levels,
+)
+from .order_arena import OrderArena
+from .order_index import DenseOrderIndex, OrderIndex
+
+
+class ArrayArenaLimitOrderBook(BaseLimitOrderBook):
+    """A flat linear array implementation of a limit order book backed by an
+    arena of resting orders.
+
+    As with `ArrayDequeLimitOrderBook`, the price levels are looked up via a
+    flat array indexed by price. However, the resting orders are held as
+    structure-of-arrays in an `OrderArena` rather than as `LimitOrder`
+    objects in a deque, such that the matching loop can be compiled with
+    numba. Matches are written by the compiled kernel to a preallocated
+    buffer and dispatched once the kernel returns.
+
+    Rather than allocating a `MatchedOrder` for each match, matches are
+    recorded as rows of a preallocated ring buffer of `match_ring_size` rows,
+    which can be read back via `drain_matches` or `get_latest_matches`. Only
+    if `execute` is overridden by a subclass are the matches materialised as
+    `MatchedOrder` objects and passed to `execute`.
+
+    Orders can also be added in bulk via `add_batch`, in which case the
+    whole batch is matched and enqueued within a single compiled loop. This
+    is the fast path of the book: `add` still makes one call of the compiled
+    kernel per order, and the fixed cost of passing the arena arrays to the
+    kernel outweighs the matching itself for a single order, such that
+    per-order adds are slower than those of the pure Python deque books.
+
+    If the order identifiers are non-negative integers, e.g., assigned from a
+    counter, `int_order_ids` can be set to look up the arena slot of an order
+    from a flat array rather than a dictionary.
+
+    If `shared_memory` is set, the arena is placed in shared memory with a
+    fixed capacity of `arena_capacity` orders, such that other processes can
+    read the resting orders and price levels of the book via
+    `OrderArena.attach(book.arena_name)` while it is being updated. The
+    shared memory block is released by `close`.
+
+    References
+    ----------
+    . https://numba.readthedocs.io/en/stable/user/performance-tips.html
+    . https://gist.github.com/elan2wang/49e85e6d7e5a9b1d9ccf1c70a4425c58
+    """
+
+    def __init__(
+            self,
+            name: AnyStr,
+            max_price: int,
+            match_buffer_size: int = 1024,
+            match_ring_size: int = 65536,
+            int_order_ids: bool = False,
+            arena_capacity: int = 1024,
+            shared_memory: bool = False) -> None:
+        if match_ring_size < match_buffer_size:
+            raise ValueError(
+                "match_ring_size must be at least match_buffer_size"
+            )
+
+        super().__init__(name, max_price)
+        self.bid_max = 0
+        self.ask_min = max_price
+        self.orders = DenseOrderIndex() if int_order_ids else OrderIndex()
+        self._arena = OrderArena(max_price, arena_capacity, shared_memory)
+        self._matched_out = numpy.empty((match_buffer_size, 6), numpy.int64)
+        self._filled_out = numpy.empty(match_buffer_size, numpy.int64)
+        self._match_ring = numpy.empty((match_ring_size, 5), numpy.int64)
+        self._match_head = 0
+        self._match_drained = 0
+
+        # Scratch arrays passing a single order added via `add` to the batch
+        # kernel, as a batch of one
+        self._taker_trader = numpy.zeros(1, dtype=numpy.int64)
+        self._taker_side = numpy.zeros(1, dtype=numpy.int64)
+        self._taker_price = numpy.zeros(1, dtype=numpy.int64)
+        self._taker_qty = numpy.zeros(1, dtype=numpy.int64)
+        self._taker_slot = numpy.zeros(1, dtype=numpy.int64)
+        self._execute_matches = (
+            type(self).execute is not BaseLimitOrderBook.execute
+        )
+
+    def add(self, limit_order: LimitOrder) -> None:
+        """Add an order to the limit order book
+
+        The order is matched and, if not completely filled, enqueued within
+        a single call of the compiled batch kernel, see `add_batch`, with the
+        order passed as a batch of one via preallocated scratch arrays.
+        Prefer `add_batch` where the orders are known up front.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The limit order to add to the book
+        """
+        self._assign_order_id(limit_order)
+        arena = self._arena
+
+        self._taker_trader[0] = limit_order.trader_id
+        self._taker_side[0] = (
+            1 if limit_order.direction == Direction.Buy else -1
+        )
+        self._taker_price[0] = limit_order.price
+        self._taker_qty[0] = limit_order.quantity
+        self._taker_slot[0] = -1
+
+        while True:
+            end, n, arena.size, self.ask_min, self.bid_max = _add_batch(
+                arena.qty, arena.trader, arena.prev, arena.next, arena.head,
+                arena.tail, arena.active_bits, arena.active_summary,
+                arena.level_qty, arena.level_count, arena.price,
+                arena.free_heads, arena.free_bits, arena.free_summary,
+                arena.size, self.ask_min, self.bid_max, self.max_price,
+                self._taker_trader, self._taker_side, self._taker_price,
+                self._taker_qty, 0, self._taker_slot, self._matched_out,
+            )
+
+            if end:
+                # Register the order if enqueued in the book, before the
+                # matches are dispatched
+                idx = self._taker_slot[0]
+                if idx != -1:
+                    self.orders.add(limit_order.id, int(idx))
+
+            if n:
+                self._dispatch_matches(
+                    self._matched_out[:n], self._taker_trader,
+                    self._taker_side,
+                )
+
+            if end:
+                break
+
+            if n < len(self._matched_out):
+                # Ran out of free slots, see `add_batch`
+                arena.ensure_free()
+
+        limit_order.quantity = int(self._taker_qty[0])
+
+    def add_batch(
+            self,
+            trader_ids: numpy.ndarray,
+            directions: numpy.ndarray,
+            quantities: numpy.ndarray,
+            prices: numpy.ndarray,
+            order_ids: Optional[numpy.ndarray] = None,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """Add a batch of orders to the limit order book
+
+        The orders are matched and enqueued in sequence, as if they were
+        passed one at a time to `add`, but within a single compiled loop.
+
+        Parameters
+        ----------
+        trader_ids: numpy.ndarray
+            The trader identifier of each order.
+        directions: numpy.ndarray
+            The direction of each order, given as `Direction.Buy.value` or
+            `Direction.Sell.value`.
+        quantities: numpy.ndarray
+            The quantity of each order.
+        prices: numpy.ndarray
+            The price of each order.
+        order_ids: Optional[numpy.ndarray]
+            The identifier of each order, used to cancel orders resting in the
+            book. If not provided, identifiers are assigned to the orders in
+            sequence from the order identifier counter of the book.
+
+        Returns
+        -------
+        Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The buy trader identifier, sell trader identifier, quantity and
+            price of each match.
+
+        Raises
+        ------
+        ValueError
+            If the order identifiers are repeated within the batch or already
+            in the book.
+        """
+        trader_ids = numpy.asarray(trader_ids, dtype=numpy.int64)
+        n_orders = len(trader_ids)
+
+        if order_ids is None:
+            order_ids = numpy.fromiter(
+                itertools.islice(self._unused_order_ids(), n_orders),
+                dtype=numpy.int64,
+                count=n_orders,
+            )
+        else:
+            order_ids = numpy.asarray(order_ids)
+            if (len(numpy.unique(order_ids)) < n_orders
+                    or any(i in self.orders for i in order_ids.tolist())):
+                raise ValueError(
+                    "The order ids of a batch must be unique and not already "
+                    "in the book"
+                )
+
+        sides = numpy.where(
+            numpy.asarray(directions) == Direction.Buy.value, 1, -1
+        )
+        quantities = numpy.array(quantities, dtype=numpy.int64)
+        prices = numpy.asarray(prices, dtype=numpy.int64)
+
+        arena = self._arena
+        slots = numpy.full(n_orders, -1, dtype=numpy.int64)
+        matches = []
+        start = 0
+
+        while start < n_orders:
+            end, n, arena.size, self.ask_min, self.bid_max = (
+                _add_batch(
+                    arena.qty, arena.trader, arena.prev, arena.next,
+                    arena.head, arena.tail, arena.active_bits,
+                    arena.active_summary, arena.level_qty, arena.level_count,
+                    arena.price, arena.free_heads, arena.free_bits,
+                    arena.free_summary, arena.size, self.ask_min,
+                    self.bid_max, self.max_price, trader_ids, sides, prices,
+                    quantities, start, slots, self._matched_out,
+                )
+            )
+
+            # Register orders enqueued in the book before dispatching the
+            # matches, which may have since filled them
+            resting = start + numpy.flatnonzero(slots[start:end] != -1)
+            self.orders.add_many(order_ids[resting], slots[resting])
+
+            count = self._match_head
+            self._dispatch_matches(self._matched_out[:n], trader_ids, sides)
+            matches.append(
+                self._ring_rows(count, self._match_head)[:, :4].copy()
+            )
+
+            if end < n_orders and n < len(self._matched_out):
+                # Ran out of free slots, which the slots of the orders filled
+                # since may have replenished, otherwise grow the arena
+                arena.ensure_free()
+
+            start = end
+
+        if not matches:
+            # No orders in the batch
+            return tuple(numpy.empty(0, dtype=numpy.int64) for _ in range(4))
+
+        buy_trader_id, sell_trader_id, quantity, price = (
+            numpy.concatenate(matches).T
+        )
+        return buy_trader_id, sell_trader_id, quantity, price
+
+    def add_many(
+            self,
+            trader_ids: numpy.ndarray,
+            directions: numpy.ndarray,
+            quantities: numpy.ndarray,
+            prices: numpy.ndarray,
+            order_ids: Optional[numpy.ndarray] = None) -> None:
+        """Add a batch of limit orders to the limit order book.
+
+        The batch is matched in a single compiled loop, see `add_batch`.
+
+        Parameters
+        ----------
+        trader_ids: numpy.ndarray
+            The trader identifier of each order.
+        directions: numpy.ndarray
+            The direction of each order, given as `Direction.Buy.value` or
+            `Direction.Sell.value`.
+        quantities: numpy.ndarray
+            The quantity of each order.
+        prices: numpy.ndarray
+            The price of each order.
+        order_ids: Optional[numpy.ndarray]
+            The identifier of each order, see `add_batch`.
+        """
+        self.add_batch(trader_ids, directions, quantities, prices, order_ids)
+
+    def _dispatch_matches(
+            self,
+            matched: numpy.ndarray,
+            trader_ids: numpy.ndarray,
+            sides: numpy.ndarray,
+    ) -> None:
+        """Record the matches written to the match buffer by the kernel
+
+        Parameters
+        ----------
+        matched: numpy.ndarray
+            The matches written to the match buffer.
+        trader_ids: numpy.ndarray
+            The trader identifier of the incoming orders.
+        sides: numpy.ndarray
+            The direction of the incoming orders, +1 for buy orders and -1
+            for sell orders.
+        """
+        count = self._match_head
+        self._match_head, n_filled = _record_matches(
+            self._match_ring, count, matched, trader_ids, sides,
+            self._filled_out,
+        )
+
+        if n_filled:
+            # Release the slots of resting orders that were completely filled
+            filled_slots = self._filled_out[:n_filled]
+            self.orders.release_many(filled_slots)
+            self._arena.free_many(filled_slots)
+
+        if self._execute_matches:
+            for buy_trader_id, sell_trader_id, quantity, price, seq in (
+                    self._ring_rows(count, self._match_head).tolist()):
+                self.execute(
+                    MatchedOrder(
+                        buy_trader_id=buy_trader_id,
+                        sell_trader_id=sell_trader_id,
+                        quantity=quantity,
+                        price=price,
+                        id=seq,
+                    )
+                )
+
+    def _ring_rows(self, start: int, stop: int) -> numpy.ndarray:
+        """Returns the rows of the match ring buffer for the matches with
+        sequence numbers from `start` up to `stop`, or as many of the most
+        recent as are still held in the ring buffer.
+
+        The rows are a view of the ring buffer unless they wrap around the
+        end of it.
+        """
+        ring = self._match_ring
+        capacity = len(ring)
+        start = max(start, stop - capacity, 0)
+
+        lo = start % capacity
+        hi = lo + max(stop - start, 0)
+
+        if hi <= capacity:
+            return ring[lo:hi]
+
+        return numpy.concatenate((ring[lo:], ring[:hi - capacity]))
+
+    def drain_matches(self) -> numpy.ndarray:
+        """Returns the matches recorded since the last call to
+        `drain_matches`, oldest first.
+
+        Matches are returned as rows with columns (buy trader, sell trader,
+        quantity, price, sequence number). Where possible, the rows are a
+        view of the match ring buffer, so are only valid until further
+        matches are recorded. If more than `match_ring_size` matches were
+        recorded since the last call, only the most recent are returned.
+
+        Returns
+        -------
+        numpy.ndarray
+            The matches recorded since the last call.
+        """
+        rows = self._ring_rows(self._match_drained, self._match_head)
+        self._match_drained = self._match_head
+        return rows
+
+    @property
+    def num_matches(self) -> int:
+        """The number of matches recorded by the limit order book."""
+        return self._match_head
+
+    def get_latest_matches(self, n=10) -> pandas.DataFrame:
+        """Returns the latest matches of the order book as a DataFrame."""
+        rows = self._ring_rows(self._match_head - n, self._match_head)[::-1]
+        return pandas.DataFrame({
+            "Id": rows[:, 4],
+            "BuyTraderId": rows[:, 0],
+            "SellTraderId": rows[:, 1],
+            "Quantity": rows[:, 2],
+            "Price": rows[:, 3],
+        })
+
+    def cancel(self, order_id: AnyStr) -> None:
+        """Cancel limit order with the given order identifier
+
+        Parameters
+        ----------
+        order_id: AnyStr
+            Deletes the limit order with the order identifier from the book
+        """
+        arena = self._arena
+        price = arena.remove(self.orders.pop(order_id))
+
+        if arena.level_count[price] == 0:
+            # Cancelled the last order at the best price, move the best price
+            # to the next non-empty price level
+            if price == self.ask_min:
+                self.ask_min = next_set_bit(
+                    arena.active_bits, arena.active_summary, price,
+                    self.max_price,
+                )
+            elif price == self.bid_max:
+                self.bid_max = prev_set_bit(
+                    arena.active_bits, arena.active_summary, price
+                )
+
+    @property
+    def arena_name(self) -> Optional[str]:
+        """The name of the shared memory block of the arena, if shared
+
+        Returns
+        -------
+        Optional[str]
+            The name to pass to `OrderArena.attach`, or None if the arena is
+            not in shared memory.
+        """
+        return self._arena.name
+
+    def close(self) -> None:
+        """Release the shared memory block of the arena, if shared
+
+        The block is destroyed, such that processes attached to the arena
+        must close their views of it too. The limit order book must not be
+        used once closed.
+        """
+        self._arena.close(unlink=True)
+
+    @property
+    def best_bid(self) -> int:
+        """The current best bid price
+
+        Returns
+        -------
+        int
+            The current best bid price
+        """
+        return self.bid_max
+
+    @property
+    def best_ask(self) -> int:
+        """The current best ask price
+
+        Returns
+        -------
+        int
+            The current best ask price
+        """
+        return self.ask_min
+
+    def _levels_as_dataframe(self, prices: numpy.ndarray) -> pandas.DataFrame:
+        """Returns a summary of the orders at the given price levels."""
+        return pandas.DataFrame({
+            "Price": prices,
+            "Quantity": self._arena.level_qty[prices],
+            "NumOrders": self._arena.level_count[prices],
+        })
+
+    def get_top_bids_as_dataframe(self, levels=10) -> pandas.DataFrame:
+        """Get a DataFrame summary of top bids in the order book.
+
+        Parameters
+        ----------
+        levels: int
+            The number of price levels to include in the table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas DataFrame summary of bids at the top of the book.
+        """
+        arena = self._arena
+        return self._levels_as_dataframe(
+            _top_bid_levels(
+                arena.active_bits, arena.active_summary, self.best_bid, levels
+            )
+        )
+
+    def get_top_asks_as_dataframe(self, levels=10) -> pandas.DataFrame:
+        """Get a DataFrame summary of top asks in the order book.
+
+        Parameters
+        ----------
+        levels: int
+            The number of price levels to include in the table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas.DataFrame summary of asks at the top of the book.
+        """
+        arena = self._arena
+        return self._levels_as_dataframe(
+            _top_ask_levels(
+                arena.active_bits, arena.active_summary, self.best_ask,
+                self.max_price, levels,
+            )
+        )
@@ -0,0 +1,402 @@
+"""Numba compiled kernels operating on an `OrderArena`.
+
+The kernels only operate on `numpy.int64` arrays and scalars, such that the
+matching loop runs without touching any Python objects. Matches are written
+to a preallocated `matched_out` buffer with columns (slot, trader, quantity,
+price, filled, taker), where `filled` flags that the resting order in `slot`
+was completely filled and `taker` is the index of the incoming order. If the
+buffer fills up, the kernel returns early and can be called again to resume
+matching.
+
+Non-empty price levels are tracked in a two-level `numpy.uint64` bitset,
+one bit per price, such that stepping over empty price levels scans 64 price
+levels per word rather than one at a time, see `limit_order_book.base.bitset`.
+"""
+import numba
+import numpy
+
+from limit_order_book.base.bitset import (
+    clear_bit,
+    next_set_bit,
+    prev_set_bit,
+    set_bit,
+)
+
+
+@numba.njit(cache=True)
+def _match(
+        qty, trader, prv, nxt, head, tail, bits, summary, level_qty,
+        level_count, best, max_price, side, price, quantity, taker,
+        matched_out):
+    """Match an incoming order against the resting orders on the opposite
+    side of the book.
+
+    The direction of the incoming order is given by `side`, +1 for a buy
+    order matched against the asks from `best` upwards, and -1 for a sell
+    order matched against the bids from `best` downwards.
+
+    Price levels the order sweeps entirely, as told by `level_qty`, are
+    emptied in bulk, such that only the last price level touched is consumed
+    order by order.
+
+    Returns
+    -------
+    Tuple[int, int, int]
+        The number of matches written, the unfilled quantity of the incoming
+        order and the updated best price on the opposite side of the book.
+    """
+    n = 0
+
+    while quantity > 0 and (price - best) * side >= 0:
+        idx = head[best]
+
+        if (
+                idx != -1 and quantity >= level_qty[best] and
+                n + level_count[best] <= matched_out.shape[0]
+        ):
+            # The order sweeps the whole price level, so fill every resting
+            # order outright and empty the price level in one go rather than
+            # unlinking the resting orders one at a time
+            while idx != -1:
+                matched_out[n, 0] = idx
+                matched_out[n, 1] = trader[idx]
+                matched_out[n, 2] = qty[idx]
+                matched_out[n, 3] = best
+                matched_out[n, 4] = 1
+                matched_out[n, 5] = taker
+                n += 1
+
+                qty[idx] = 0
+                idx = nxt[idx]
+
+            quantity -= level_qty[best]
+            level_qty[best] = 0
+            level_count[best] = 0
+            head[best] = -1
+            tail[best] = -1
+            clear_bit(bits, summary, best)
+
+            if quantity == 0:
+                return n, quantity, best
+
+            idx = -1
+
+        while idx != -1:
+            if n == matched_out.shape[0]:
+                return n, quantity, best
+
+            fill = min(qty[idx], quantity)
+            matched_out[n, 0] = idx
+            matched_out[n, 1] = trader[idx]
+            matched_out[n, 2] = fill
+            matched_out[n, 3] = best
+            matched_out[n, 4] = qty[idx] == fill
+            matched_out[n, 5] = taker
+            n += 1
+
+            qty[idx] -= fill
+            quantity -= fill
+            level_qty[best] -= fill
+
+            if qty[idx] == 0:
+                # Resting order completely filled, remove from price level
+                level_count[best] -= 1
+                idx = nxt[idx]
+                head[best] = idx
+                if idx == -1:
+                    tail[best] = -1
+                    clear_bit(bits, summary, best)
+                else:
+                    prv[idx] = -1
+
+            if quantity == 0:
+                return n, quantity, best
+
+        # Exhausted all orders at the current price level, move to the next
+        # non-empty price level
+        if side > 0:
+            if best >= max_price:
+                break
+            best = next_set_bit(bits, summary, best, max_price)
+        else:
+            if best <= 0:
+                break
+            best = prev_set_bit(bits, summary, best)
+
+    return n, quantity, best
+
+
+@numba.njit(cache=True)
+def _append(
+        qty, trader, prv, nxt, head, tail, bits, summary, level_qty,
+        level_count, prices, idx, price, quantity, trader_id):
+    """Append the order in slot `idx` to the back of the queue at `price`."""
+    last = tail[price]
+
+    qty[idx] = quantity
+    trader[idx] = trader_id
+    prices[idx] = price
+    prv[idx] = last
+    nxt[idx] = -1
+
+    if last == -1:
+        head[price] = idx
+        set_bit(bits, summary, price)
+    else:
+        nxt[last] = idx
+    tail[price] = idx
+
+    level_qty[price] += quantity
+    level_count[price] += 1
+
+
+@numba.njit(cache=True)
+def _add_batch(
+        qty, trader, prv, nxt, head, tail, bits, summary, level_qty,
+        level_count, prices, free_heads, free_bits, free_summary, size,
+        ask_min, bid_max, max_price, order_trader, order_side, order_price,
+        order_qty, start, slots, matched_out):
+    """Add a batch of orders to the book, starting from order `start`.
+
+    The direction of each order is given by `order_side`, +1 for buy orders
+    and -1 for sell orders.
+
+    The unfilled quantity of each order is written back to `order_qty` and
+    the slot each order rests in, if any, is written to `slots`. Slots are
+    allocated as by `_alloc`. If the match buffer fills up or there is no
+    free slot left in the arena, the kernel returns early and can be called
+    again to resume from the order it stopped at, once the caller has
+    dispatched the matches or grown the arena.
+
+    Returns
+    -------
+    Tuple[int, int, int, int, int]
+        The index of the next order to process, the number of matches
+        written, the updated arena size and the updated best ask and bid
+        prices.
+    """
+    n = 0
+
+    for i in range(start, len(order_trader)):
+        price = order_price[i]
+        side = order_side[i]
+
+        k, quantity, best = _match(
+            qty, trader, prv, nxt, head, tail, bits, summary, level_qty,
+            level_count, ask_min if side > 0 else bid_max, max_price, side,
+            price, order_qty[i], i, matched_out[n:],
+        )
+
+        if side > 0:
+            ask_min = best
+        else:
+            bid_max = best
+
+        n += k
+        order_qty[i] = quantity
+
+        if quantity == 0:
+            continue
+
+        if n == len(matched_out):
+            # Match buffer is full, resume from this order
+            return i, n, size, ask_min, bid_max
+
+        # Enqueue the unfilled quantity in the book
+        idx, size = _alloc(
+            nxt, free_heads, free_bits, free_summary, size, len(qty),
+            price >> 6,
+        )
+        if idx == -1:
+            # Arena is full, resume from this order
+            return i, n, size, ask_min, bid_max
+
+        _append(
+            qty, trader, prv, nxt, head, tail, bits, summary, level_qty,
+            level_count, prices, idx, price, quantity, order_trader[i],
+        )
+        slots[i] = idx
+
+        if side > 0:
+            starting_price = max(price, bid_max)
+            if head[starting_price] != -1:
+                bid_max = starting_price
+            else:
+                bid_max = prev_set_bit(bits, summary, starting_price)
+        else:
+            starting_price = min(price, ask_min)
+            if head[starting_price] != -1:
+                ask_min = starting_price
+            else:
+                ask_min = next_set_bit(
+                    bits, summary, starting_price, max_price
+                )
+
+    return len(order_trader), n, size, ask_min, bid_max
+
+
+@numba.njit(cache=True)
+def _alloc(nxt, free_heads, free_bits, free_summary, size, capacity, band):
+    """Allocate an arena slot for an order in the given price band.
+
+    The slot is popped from the free list of the band if it has one, and
+    otherwise taken from `size` onwards. Once the arena is full, the slot is
+    popped from the free list of the nearest band with a free slot, as found
+    from the `free_bits` bitset of bands with a non-empty free list.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The allocated slot, or -1 if there is no free slot left, and the
+        updated arena size.
+    """
+    if free_heads[band] == -1:
+        if size < capacity:
+            return size, size + 1
+
+        # Take a slot from the nearest band with a free slot instead
+        n_bands = len(free_heads)
+        other = next_set_bit(free_bits, free_summary, band, n_bands)
+        if other == n_bands:
+            other = prev_set_bit(free_bits, free_summary, band)
+            if free_heads[other] == -1:
+                return -1, size
+        band = other
+
+    idx = free_heads[band]
+    free_heads[band] = nxt[idx]
+    if nxt[idx] == -1:
+        clear_bit(free_bits, free_summary, band)
+
+    return idx, size
+
+
+@numba.njit(cache=True)
+def _push_free(nxt, free_heads, free_bits, free_summary, prices, slots):
+    """Push the given slots onto the free lists of the price bands of the
+    orders they held, chained through `nxt` from `free_heads`."""
+    for idx in slots:
+        band = prices[idx] >> 6
+        nxt[idx] = free_heads[band]
+        free_heads[band] = idx
+        set_bit(free_bits, free_summary, band)
+
+
+@numba.njit(cache=True)
+def _unlink(
+        qty, prv, nxt, head, tail, bits, summary, level_qty, level_count,
+        prices, idx):
+    """Remove the order in slot `idx` from its price level queue and return
+    the price level."""
+    price = prices[idx]
+    before = prv[idx]
+    after = nxt[idx]
+
+    level_qty[price] -= qty[idx]
+    level_count[price] -= 1
+
+    if before == -1:
+        head[price] = after
+        if after == -1:
+            clear_bit(bits, summary, price)
+    else:
+        nxt[before] = after
+
+    if after == -1:
+        tail[price] = before
+    else:
+        prv[after] = before
+
+    prv[idx] = -1
+    nxt[idx] = -1
+
+    return price
+
+
+@numba.njit(cache=True)
+def _top_bid_levels(bits, summary, bid_max, levels):
+    """Returns up to `levels` non-empty price levels from `bid_max` down."""
+    out = numpy.empty(levels, dtype=numpy.int64)
+    n = 0
+    price = bid_max
+
+    if levels > 0 and price > 0 and bits[price >> 6] >> (price & 63) & 1:
+        out[n] = price
+        n += 1
+
+    while n < levels:
+        price = prev_set_bit(bits, summary, price)
+        if price <= 0:
+            break
+        out[n] = price
+        n += 1
+
+    return out[:n]
+
+
+@numba.njit(cache=True)
+def _top_ask_levels(bits, summary, ask_min, max_price, levels):
+    """Returns up to `levels` non-empty price levels from `ask_min` up."""
+    out = numpy.empty(levels, dtype=numpy.int64)
+    n = 0
+    price = ask_min
+
+    if (
+            levels > 0 and price < max_price and
+            bits[price >> 6] >> (price & 63) & 1
+    ):
+        out[n] = price
+        n += 1
+
+    while n < levels:
+        price = next_set_bit(bits, summary, price, max_price)
+        if price >= max_price:
+            break
+        out[n] = price
+        n += 1
+
+    return out[:n]
+
+
+@numba.njit(cache=True)
+def _record_matches(ring, count, matched, trader_ids, sides, filled_out):
+    """Write the matches in `matched` to the match ring buffer.
+
+    The ring buffer has columns (buy trader, sell trader, quantity, price,
+    sequence number), where the sequence number counts all matches recorded
+    since the book was created. Row `count % len(ring)` is written next, such
+    that the oldest matches are overwritten once the ring buffer is full.
+
+    The slots of the resting orders completely filled by the matches are
+    written to `filled_out`, which must be at least as long as `matched`.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The updated number of matches recorded and the number of slots
+        written to `filled_out`.
+    """
+    capacity = ring.shape[0]
+    n_filled = 0
+
+    for j in range(matched.shape[0]):
+        row = count % capacity
+        taker = matched[j, 5]
+
+        if sides[taker] > 0:
+            ring[row, 0] = trader_ids[taker]
+            ring[row, 1] = matched[j, 1]
+        else:
+            ring[row, 0] = matched[j, 1]
+            ring[row, 1] = trader_ids[taker]
+
+        ring[row, 2] = matched[j, 2]
+        ring[row, 3] = matched[j, 3]
+        ring[row, 4] = count
+        count += 1
+
+        if matched[j, 4] != 0:
+            filled_out[n_filled] = matched[j, 0]
+            n_filled += 1
+
+    return count, n_filled
@@ -0,0 +1,352 @@
+import numpy
+from multiprocessing.shared_memory import SharedMemory
+from typing import AnyStr, Dict, Optional
+
+from limit_order_book.base.bitset import set_bit
+
+from .kernels import _alloc, _append, _push_free, _unlink
+
+
+class OrderArena:
+    """Structure-of-arrays storage of resting limit orders.
+
+    Rather than a deque of `LimitOrder` objects at each price level, the
+    resting orders are held in flat `numpy.int64` arrays indexed by an arena
+    slot. The orders at each price level are chained into an intrusive doubly
+    linked list through `prev` and `next`, with `head` and `tail` holding the
+    first and last slot at each price, or -1 if the price level is empty.
+
+    The fields read on every step of the matching loop, the quantity and
+    trader identifier of an order, are interleaved in a single `hot` array,
+    such that both are fetched from the same cache line and a cache line
+    holds the hot fields of four orders. `qty` and `trader` are strided views
+    of its columns. The price of each order is only read on cancellation, so
+    is kept apart in the cold `price` array.
+
+    Slots released by filled or cancelled orders are recycled via free
+    lists, such that the arena only grows once there is no free slot left,
+    i.e., with the peak number of resting orders. Each free list is an
+    intrusive stack chained through `next`, such that allocating and freeing
+    a slot are a couple of integer writes rather than operations on a Python
+    list.
+
+    There is a free list for each band of 64 price levels, with its head in
+    `free_heads`, and a slot is preferably reused for an order in the same
+    band as the order it last held. The orders resting around the best
+    prices, which are matched one after another, then keep to the same set of
+    slots rather than being scattered over the arena. Only once the arena is
+    full is a slot taken from the free list of the nearest other band, found
+    from the `free_bits` bitset of bands with a free slot, such that slots
+    freed in one band are never stranded as prices drift away from it.
+
+    If `shared` is set, the arrays are placed in a single block of shared
+    memory rather than allocated privately, such that other processes can
+    `attach` to the arena by name and read the book without any copying or
+    IPC. A shared arena cannot grow, so `capacity` must allow for the
+    maximum number of resting orders. The process that creates the arena is
+    the only writer, attached arenas are read-only.
+
+    Attributes
+    ----------
+    hot: numpy.ndarray
+        The quantity and trader identifier of the order in each slot.
+    prev: numpy.ndarray
+        The slot of the previous order at the same price level, -1 if first.
+    next: numpy.ndarray
+        The slot of the next order at the same price level, -1 if last.
+    qty: numpy.ndarray
+        The outstanding quantity of the order in each slot.
+    trader: numpy.ndarray
+        The trader identifier of the order in each slot.
+    price: numpy.ndarray
+        The price level of the order in each slot.
+    head: numpy.ndarray
+        The slot of the first order at each price level.
+    tail: numpy.ndarray
+        The slot of the last order at each price level.
+    active_bits: numpy.ndarray
+        A bitset with a bit set for each non-empty price level.
+    active_summary: numpy.ndarray
+        A bitset with a bit set for each non-zero word of `active_bits`.
+    level_qty: numpy.ndarray
+        The total outstanding quantity at each price level.
+    level_count: numpy.ndarray
+        The number of resting orders at each price level.
+    shm: Optional[SharedMemory]
+        The shared memory block holding the arrays, if shared.
+    """
+
+    __slots__ = (
+        "hot", "prev", "next", "qty", "trader", "price", "head", "tail",
+        "active_bits", "active_summary", "level_qty", "level_count", "size",
+        "free_heads", "free_bits", "free_summary", "shm",
+    )
+
+    def __init__(
+            self,
+            max_price: int,
+            capacity: int = 1024,
+            shared: bool = False) -> None:
+        layout = _layout(max_price, capacity)
+
+        if shared:
+            self.shm = SharedMemory(
+                create=True, size=sum(_nbytes(*v) for v in layout.values())
+            )
+            arrays = _views(layout, self.shm.buf)
+            arrays["header"][:] = (max_price, capacity)
+        else:
+            self.shm = None
+            arrays = {
+                name: numpy.empty(shape, dtype=dtype)
+                for name, (shape, dtype) in layout.items()
+            }
+
+        self._bind(arrays)
+
+        for array in (self.prev, self.next, self.head, self.tail):
+            array.fill(-1)
+        for array in (
+                self.hot, self.price, self.active_bits, self.active_summary,
+                self.level_qty, self.level_count):
+            array.fill(0)
+
+        self.size = 0
+        self.free_heads = numpy.full(
+            len(self.active_bits), -1, dtype=numpy.int64
+        )
+        self.free_bits = numpy.zeros(
+            len(self.free_heads) // 64 + 1, dtype=numpy.uint64
+        )
+        self.free_summary = numpy.zeros(
+            len(self.free_bits) // 64 + 1, dtype=numpy.uint64
+        )
+
+    @classmethod
+    def attach(cls, name: AnyStr) -> "OrderArena":
+        """Attach to a shared arena created by another process
+
+        Parameters
+        ----------
+        name: AnyStr
+            The name of the shared memory block of the arena, see `name`.
+
+        Returns
+        -------
+        OrderArena
+            A read-only view of the shared arena.
+        """
+        shm = SharedMemory(name=name)
+        max_price, capacity = numpy.ndarray(
+            (2,), dtype=numpy.int64, buffer=shm.buf
+        )
+        arrays = _views(_layout(int(max_price), int(capacity)), shm.buf)
+
+        for array in arrays.values():
+            array.flags.writeable = False
+
+        arena = cls.__new__(cls)
+        arena.shm = shm
+        arena._bind(arrays)
+        arena.size = len(arena.qty)
+        arena.free_heads = None
+        arena.free_bits = None
+        arena.free_summary = None
+        return arena
+
+    def _bind(self, arrays: Dict[str, numpy.ndarray]) -> None:
+        """Bind the arrays of the arena to its attributes."""
+        self.hot = arrays["hot"]
+        self.qty = self.hot[:, 0]
+        self.trader = self.hot[:, 1]
+        self.prev = arrays["prev"]
+        self.next = arrays["next"]
+        self.price = arrays["price"]
+        self.head = arrays["head"]
+        self.tail = arrays["tail"]
+        self.active_bits = arrays["active_bits"]
+        self.active_summary = arrays["active_summary"]
+        self.level_qty = arrays["level_qty"]
+        self.level_count = arrays["level_count"]
+
+    @property
+    def name(self) -> Optional[str]:
+        """The name of the shared memory block of the arena, if shared."""
+        return None if self.shm is None else self.shm.name
+
+    def close(self, unlink: bool = False) -> None:
+        """Release the shared memory block of the arena, if shared
+
+        The arrays of the arena must not be used once closed.
+
+        Parameters
+        ----------
+        unlink: bool
+            Whether to also destroy the shared memory block, which should be
+            done once by the process that created the arena.
+        """
+        if self.shm is not None:
+            # Drop all views of the block, as it cannot be closed otherwise
+            for name in _FIELDS + ("qty", "trader"):
+                setattr(self, name, None)
+
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+            self.shm = None
+
+    def reserve(self, n: int) -> None:
+        """Ensure there is capacity for `n` further orders in the arena
+
+        Parameters
+        ----------
+        n: int
+            The number of orders to reserve capacity for.
+        """
+        if self.size + n > len(self.qty):
+            self._grow(max(2 * len(self.qty), self.size + n))
+
+    def _grow(self, capacity: int) -> None:
+        """Grow the capacity of the per-order arrays."""
+        if self.shm is not None:
+            raise MemoryError(
+                f"Shared arena is full with {len(self.qty)} orders"
+            )
+
+        self.prev = numpy.resize(self.prev, capacity)
+        self.next = numpy.resize(self.next, capacity)
+        self.hot = numpy.resize(self.hot, (capacity, 2))
+        self.qty = self.hot[:, 0]
+        self.trader = self.hot[:, 1]
+        self.price = numpy.resize(self.price, capacity)
+
+    def alloc(self, price: int) -> int:
+        """Returns a free arena slot for an order at the given price, growing
+        the arena only if there is no free slot left."""
+        idx, self.size = _alloc(
+            self.next, self.free_heads, self.free_bits, self.free_summary,
+            self.size, len(self.qty), price >> 6,
+        )
+        if idx != -1:
+            return int(idx)
+
+        self._grow(2 * len(self.qty))
+
+        idx = self.size
+        self.size += 1
+        return idx
+
+    def ensure_free(self) -> None:
+        """Ensure there is a free slot for a further order, growing the arena
+        only if there is no free slot left in any band."""
+        if self.size == len(self.qty) and not self.free_summary.any():
+            self._grow(2 * len(self.qty))
+
+    def free(self, idx: int) -> None:
+        """Return the given arena slot to the free list of its band."""
+        band = self.price[idx] >> 6
+        self.next[idx] = self.free_heads[band]
+        self.free_heads[band] = idx
+        set_bit(self.free_bits, self.free_summary, band)
+
+    def free_many(self, slots: numpy.ndarray) -> None:
+        """Return the given arena slots to the free lists of their bands."""
+        _push_free(
+            self.next, self.free_heads, self.free_bits, self.free_summary,
+            self.price, slots,
+        )
+
+    def append(self, price: int, quantity: int, trader_id: int) -> int:
+        """Append an order to the back of the queue at the given price
+
+        Parameters
+        ----------
+        price: int
+            The price level of the order.
+        quantity: int
+            The quantity of the order.
+        trader_id: int
+            The trader identifier of the order.
+
+        Returns
+        -------
+        int
+            The arena slot of the order.
+        """
+        idx = self.alloc(price)
+        _append(
+            self.qty, self.trader, self.prev, self.next, self.head, self.tail,
+            self.active_bits, self.active_summary, self.level_qty,
+            self.level_count, self.price, idx, price, quantity, trader_id,
+        )
+        return idx
+
+    def remove(self, idx: int) -> int:
+        """Unlink the order in the given slot from its price level and free
+        the slot.
+
+        As the price levels are doubly linked, this is O(1) regardless of
+        the position of the order in the queue.
+
+        Parameters
+        ----------
+        idx: int
+            The arena slot of the order to remove.
+
+        Returns
+        -------
+        int
+            The price level the order was removed from.
+        """
+        price = _unlink(
+            self.qty, self.prev, self.next, self.head, self.tail,
+            self.active_bits, self.active_summary, self.level_qty,
+            self.level_count, self.price, idx,
+        )
+        self.free(idx)
+        return price
+
+
+_FIELDS = (
+    "hot", "prev", "next", "price", "head", "tail", "active_bits",
+    "active_summary", "level_qty", "level_count",
+)
+
+
+def _layout(max_price: int, capacity: int) -> Dict[str, tuple]:
+    """Returns the shape and dtype of each array of an arena, preceded by a
+    header recording `max_price` and `capacity`."""
+    n_words = max_price // 64 + 1
+
+    return {
+        "header": ((2,), numpy.int64),
+        "hot": ((capacity, 2), numpy.int64),
+        "prev": ((capacity,), numpy.int64),
+        "next": ((capacity,), numpy.int64),
+        "price": ((capacity,), numpy.int64),
+        "head": ((max_price + 1,), numpy.int64),
+        "tail": ((max_price + 1,), numpy.int64),
+        "active_bits": ((n_words,), numpy.uint64),
+        "active_summary": ((n_words // 64 + 1,), numpy.uint64),
+        "level_qty": ((max_price + 1,), numpy.int64),
+        "level_count": ((max_price + 1,), numpy.int64),
+    }
+
+
+def _nbytes(shape: tuple, dtype) -> int:
+    """Returns the size in bytes of an array of the given shape and dtype."""
+    return int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize
+
+
+def _views(layout: Dict[str, tuple], buffer) -> Dict[str, numpy.ndarray]:
+    """Returns arrays laid out back to back over the given buffer."""
+    arrays = {}
+    offset = 0
+
+    for name, (shape, dtype) in layout.items():
+        arrays[name] = numpy.ndarray(
+            shape, dtype=dtype, buffer=buffer, offset=offset
+        )
+        offset += _nbytes(shape, dtype)
+
+    return arrays
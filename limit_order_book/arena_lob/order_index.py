@@ -0,0 +1,133 @@
+import numpy
+from typing import Hashable, Iterable
+
+
+class OrderIndex:
+    """Maps order identifiers to the arena slot of resting orders.
+
+    The order identifiers may be of any hashable type, e.g., strings
+    assigned by the caller, and are held in a dictionary.
+    """
+
+    def __init__(self) -> None:
+        self._slots = dict()
+        self._ids = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, order_id: Hashable) -> bool:
+        return order_id in self._slots
+
+    def add(self, order_id: Hashable, idx: int) -> None:
+        """Record the arena slot of an order resting in the book
+
+        Parameters
+        ----------
+        order_id: Hashable
+            The order identifier.
+        idx: int
+            The arena slot of the order.
+        """
+        if idx >= len(self._ids):
+            self._ids.extend([None] * (idx + 1 - len(self._ids)))
+        self._ids[idx] = order_id
+        self._slots[order_id] = idx
+
+    def add_many(self, order_ids: Iterable, slots: numpy.ndarray) -> None:
+        """Record the arena slots of many orders resting in the book."""
+        for order_id, idx in zip(order_ids, slots.tolist()):
+            self.add(order_id, idx)
+
+    def pop(self, order_id: Hashable) -> int:
+        """Remove an order from the index and return its arena slot."""
+        return self._slots.pop(order_id)
+
+    def release(self, idx: int) -> None:
+        """Remove the order in the given arena slot from the index."""
+        del self._slots[self._ids[idx]]
+
+    def release_many(self, slots: numpy.ndarray) -> None:
+        """Remove the orders in the given arena slots from the index."""
+        for idx in slots.tolist():
+            self.release(idx)
+
+
+class DenseOrderIndex:
+    """Maps non-negative integer order identifiers to the arena slot of
+    resting orders.
+
+    The mapping is held in a flat array indexed by order identifier, grown
+    geometrically to cover the largest identifier seen, rather than a
+    dictionary. This is suited to identifiers assigned from a counter, and
+    allows the index to be updated for a batch of orders with array
+    operations.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._slots = numpy.full(capacity, -1, dtype=numpy.int64)
+        self._ids = numpy.full(capacity, -1, dtype=numpy.int64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, order_id: int) -> bool:
+        return 0 <= order_id < len(self._slots) and self._slots[order_id] != -1
+
+    @staticmethod
+    def _grow(array: numpy.ndarray, n: int) -> numpy.ndarray:
+        """Returns the array grown to hold at least `n` elements."""
+        grown = numpy.full(max(2 * len(array), n), -1, dtype=numpy.int64)
+        grown[:len(array)] = array
+        return grown
+
+    def add(self, order_id: int, idx: int) -> None:
+        """Record the arena slot of an order resting in the book
+
+        Parameters
+        ----------
+        order_id: int
+            The order identifier.
+        idx: int
+            The arena slot of the order.
+        """
+        if order_id >= len(self._slots):
+            self._slots = self._grow(self._slots, order_id + 1)
+        if idx >= len(self._ids):
+            self._ids = self._grow(self._ids, idx + 1)
+        self._slots[order_id] = idx
+        self._ids[idx] = order_id
+        self._size += 1
+
+    def add_many(self, order_ids: numpy.ndarray, slots: numpy.ndarray) -> None:
+        """Record the arena slots of many orders resting in the book."""
+        if len(slots) == 0:
+            return
+        order_ids = numpy.asarray(order_ids, dtype=numpy.int64)
+        if order_ids.max() >= len(self._slots):
+            self._slots = self._grow(self._slots, order_ids.max() + 1)
+        if slots.max() >= len(self._ids):
+            self._ids = self._grow(self._ids, slots.max() + 1)
+        self._slots[order_ids] = slots
+        self._ids[slots] = order_ids
+        self._size += len(slots)
+
+    def pop(self, order_id: int) -> int:
+        """Remove an order from the index and return its arena slot."""
+        if order_id not in self:
+            raise KeyError(order_id)
+        idx = int(self._slots[order_id])
+        self._slots[order_id] = -1
+        self._size -= 1
+        return idx
+
+    def release(self, idx: int) -> None:
+        """Remove the order in the given arena slot from the index."""
+        self._slots[self._ids[idx]] = -1
+        self._size -= 1
+
+    def release_many(self, slots: numpy.ndarray) -> None:
+        """Remove the orders in the given arena slots from the index."""
+        self._slots[self._ids[slots]] = -1
+        self._size -= len(slots)
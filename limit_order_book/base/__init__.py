@@ -4,4 +4,4 @@ from .order import (
     LimitOrder,
     MatchedOrder,
 )
-from .price_deque import PriceDeque
+from .price_level import PriceLevel
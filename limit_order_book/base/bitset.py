@@ -0,0 +1,104 @@
+"""Numba compiled helpers for a two-level `numpy.uint64` bitset.
+
+The bitset `bits` has one bit per index, e.g., one bit per price level that
+is non-empty, such that searching for the next set bit scans 64 indices per
+word rather than one at a time. On top of it sits a `summary` bitset with one
+bit per non-zero word of `bits`, forming a two-level 64-ary search tree over
+the indices. A search over a wide gap between set bits then scans 4096
+indices per summary word, and touches one word of `bits` at either end of
+the gap rather than every word in between.
+
+For `n` indices, `bits` holds `n // 64 + 1` words and `summary` holds
+`len(bits) // 64 + 1` words.
+
+The helpers can be called from Python as well as from other compiled
+kernels.
+"""
+import numba
+import numpy
+
+from numba.cpython.unsafe.numbers import leading_zeros, trailing_zeros
+
+_ONES = numpy.uint64(0xFFFFFFFFFFFFFFFF)
+_ONE = numpy.uint64(1)
+
+
+@numba.njit(cache=True)
+def set_bit(bits, summary, i):
+    """Set the bit at index `i`."""
+    w = i >> 6
+    bits[w] |= _ONE << numpy.uint64(i & 63)
+    summary[w >> 6] |= _ONE << numpy.uint64(w & 63)
+
+
+@numba.njit(cache=True)
+def clear_bit(bits, summary, i):
+    """Clear the bit at index `i`."""
+    w = i >> 6
+    bits[w] &= ~(_ONE << numpy.uint64(i & 63))
+    if bits[w] == 0:
+        summary[w >> 6] &= ~(_ONE << numpy.uint64(w & 63))
+
+
+@numba.njit(cache=True)
+def next_set_bit(bits, summary, i, n):
+    """Returns the index of the next set bit above `i`, or `n` if there is
+    none below `n`."""
+    i += 1
+    if i >= n:
+        return n
+
+    w = i >> 6
+    word = bits[w] & (_ONES << numpy.uint64(i & 63))
+
+    if word == 0:
+        # Find the next non-zero word of the bitset from the summary
+        w += 1
+        s = w >> 6
+        if s == len(summary):
+            return n
+
+        summary_word = summary[s] & (_ONES << numpy.uint64(w & 63))
+
+        while summary_word == 0:
+            s += 1
+            if s == len(summary):
+                return n
+            summary_word = summary[s]
+
+        w = (s << 6) + trailing_zeros(summary_word)
+        word = bits[w]
+
+    return min((w << 6) + trailing_zeros(word), n)
+
+
+@numba.njit(cache=True)
+def prev_set_bit(bits, summary, i):
+    """Returns the index of the previous set bit below `i`, or 0 if there is
+    none."""
+    i -= 1
+    if i <= 0:
+        return 0
+
+    w = i >> 6
+    word = bits[w] & (_ONES >> numpy.uint64(63 - (i & 63)))
+
+    if word == 0:
+        # Find the previous non-zero word of the bitset from the summary
+        if w == 0:
+            return 0
+
+        w -= 1
+        s = w >> 6
+        summary_word = summary[s] & (_ONES >> numpy.uint64(63 - (w & 63)))
+
+        while summary_word == 0:
+            if s == 0:
+                return 0
+            s -= 1
+            summary_word = summary[s]
+
+        w = (s << 6) + 63 - leading_zeros(summary_word)
+        word = bits[w]
+
+    return (w << 6) + 63 - leading_zeros(word)
@@ -1,11 +1,14 @@
 import abc
+import array
+import itertools
+import numpy
 import pandas
-from typing import AnyStr, List
+from typing import AnyStr, Iterator, Optional
 
 from rich.panel import Panel
 from rich.layout import Layout
 
-from .order import LimitOrder, MatchedOrder
+from .order import Direction, LimitOrder, MatchedOrder
 from .rich import df_to_rich_table, repr_rich
 
 
@@ -28,21 +31,153 @@ class BaseLimitOrderBook(abc.ABC):
     ):
         self.name = name
         self.max_price = max_price
-        self._matches: List[MatchedOrder] = []
+        self._order_ids = itertools.count()
+        self._match_ids = itertools.count()
+
+        # Matches are logged column-wise in int64 arrays
+        self._match_buy_trader_id = array.array("q")
+        self._match_sell_trader_id = array.array("q")
+        self._match_quantity = array.array("q")
+        self._match_price = array.array("q")
+
+        # Matches are only materialised as `MatchedOrder` objects if there
+        # is an `execute` callback to pass them to, otherwise the matching
+        # loop logs them directly
+        if type(self).execute is BaseLimitOrderBook.execute:
+            self._record_match = self._log_match
+        else:
+            self._record_match = self._execute_match
 
     @abc.abstractmethod
     def add(self, limit_order: LimitOrder) -> None:
         """Add a limit order to the limit order book."""
         raise NotImplementedError
 
+    def add_many(
+            self,
+            trader_ids: numpy.ndarray,
+            directions: numpy.ndarray,
+            quantities: numpy.ndarray,
+            prices: numpy.ndarray,
+            order_ids: Optional[numpy.ndarray] = None) -> None:
+        """Add a batch of limit orders to the limit order book.
+
+        The orders are added in sequence, as if passed one at a time to
+        `add`. The columns are converted to Python integers up front, and the
+        lookup of `add` is done once for the whole batch.
+
+        Parameters
+        ----------
+        trader_ids: numpy.ndarray
+            The trader identifier of each order.
+        directions: numpy.ndarray
+            The direction of each order, given as `Direction.Buy.value` or
+            `Direction.Sell.value`.
+        quantities: numpy.ndarray
+            The quantity of each order.
+        prices: numpy.ndarray
+            The price of each order.
+        order_ids: Optional[numpy.ndarray]
+            The identifier of each order, used to cancel orders resting in the
+            book. If not provided, identifiers are assigned to the orders in
+            sequence from the order identifier counter of the book.
+        """
+        add = self.add
+
+        if order_ids is None:
+            order_ids = itertools.repeat(None)
+        else:
+            order_ids = numpy.asarray(order_ids).tolist()
+
+        for trader_id, direction, quantity, price, order_id in zip(
+                numpy.asarray(trader_ids).tolist(),
+                numpy.asarray(directions).tolist(),
+                numpy.asarray(quantities).tolist(),
+                numpy.asarray(prices).tolist(),
+                order_ids):
+            add(
+                LimitOrder(
+                    trader_id, price, quantity, Direction(direction), order_id
+                )
+            )
+
+    def _assign_order_id(self, limit_order: LimitOrder) -> None:
+        """Assign an order identifier to a limit order without one.
+
+        Identifiers are assigned from a counter of the limit order book,
+        skipping those already held in `orders` by the book, such that they
+        do not collide with integer identifiers assigned by the caller. They
+        are not unique across books.
+
+        Raises
+        ------
+        ValueError
+            If the order has an identifier already held in `orders`.
+        """
+        if limit_order.id is None:
+            limit_order.id = next(self._unused_order_ids())
+        elif limit_order.id in self.orders:
+            raise ValueError(
+                f"An order with id {limit_order.id} is already in the book"
+            )
+
+    def _unused_order_ids(self) -> Iterator[int]:
+        """Returns an iterator over the order identifier counter, skipping
+        the identifiers already held in `orders`."""
+        return itertools.filterfalse(self.orders.__contains__, self._order_ids)
+
     def execute(self, matched_order: MatchedOrder) -> None:
         """Execute match between limit orders.
 
         In a production setting, this would be a callback function that would
         provide the means to dispatch updates to market participants of trades.
-        Here, we simply keep track of matches in `_matches`.
+        Here, we simply log the matches column-wise, such that no reference to
+        the `MatchedOrder` is kept.
         """
-        self._matches.append(matched_order)
+        self._log_match(
+            matched_order.buy_trader_id,
+            matched_order.sell_trader_id,
+            matched_order.quantity,
+            matched_order.price,
+        )
+
+    def _log_match(
+            self,
+            buy_trader_id: int,
+            sell_trader_id: int,
+            quantity: int,
+            price: int) -> None:
+        """Log a match between limit orders column-wise."""
+        self._match_buy_trader_id.append(buy_trader_id)
+        self._match_sell_trader_id.append(sell_trader_id)
+        self._match_quantity.append(quantity)
+        self._match_price.append(price)
+
+    def _execute_match(
+            self,
+            buy_trader_id: int,
+            sell_trader_id: int,
+            quantity: int,
+            price: int) -> None:
+        """Pass a match between limit orders to `execute`.
+
+        The match is identified by its sequence number, counting all matches
+        passed to `execute` by the limit order book.
+        """
+        self.execute(
+            MatchedOrder(
+                buy_trader_id=buy_trader_id,
+                sell_trader_id=sell_trader_id,
+                quantity=quantity,
+                price=price,
+                id=next(self._match_ids),
+            )
+        )
+
+    @property
+    def num_matches(self) -> int:
+        """The number of matches executed by the limit order book."""
+        return len(self._match_price)
 
     @abc.abstractmethod
     def cancel(self, order_id: AnyStr) -> None:
@@ -77,10 +212,25 @@ class BaseLimitOrderBook(abc.ABC):
         raise NotImplementedError
 
     def get_latest_matches(self, n=10) -> pandas.DataFrame:
-        """Returns the latest matches of the order book as a DataFrame."""
-        return pandas.DataFrame(
-            match.as_dict for match in self._matches[-n:][::-1]
-        )
+        """Returns the latest matches of the order book as a DataFrame.
+
+        The matches are numbered in the order they were executed, the latest
+        match is listed first.
+        """
+        stop = self.num_matches
+        start = max(stop - n, 0)
+
+        def column(values: array.array) -> numpy.ndarray:
+            # Slicing copies the values, such that the log can still grow
+            return numpy.frombuffer(values[start:stop], dtype=numpy.int64)
+
+        return pandas.DataFrame({
+            "Id": numpy.arange(start, stop),
+            "BuyTraderId": column(self._match_buy_trader_id),
+            "SellTraderId": column(self._match_sell_trader_id),
+            "Quantity": column(self._match_quantity),
+            "Price": column(self._match_price),
+        })[::-1].reset_index(drop=True)
 
     def __rich__(self):
         """Method to provide a rich terminal representation of the order book
@@ -1,16 +1,15 @@
 import dataclasses
 import enum
-import uuid
 
 from typing import AnyStr, Dict, Optional, Union
 
 
-class Direction(enum.Enum):
-    Buy = enum.auto()
-    Sell = enum.auto()
+class Direction(enum.IntEnum):
+    Buy = 0
+    Sell = 1
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, eq=False)
 class LimitOrder:
     trader_id: int
     price: int
@@ -18,10 +17,15 @@ class LimitOrder:
     direction: Direction
     id: Optional[Union[int, AnyStr]] = None
 
-    def __post_init__(self):
-        self.id = uuid.uuid4().hex if self.id is None else self.id
+    # Links to the neighbouring orders at the same price level, if queued in
+    # a PriceLevel
+    prev: Optional["LimitOrder"] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+    next: Optional["LimitOrder"] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
-    @property
     def as_dict(self) -> Dict:
         return {
             "id": self.id,
@@ -30,11 +34,8 @@ class LimitOrder:
             "price": self.price,
         }
 
-    def __eq__(self, other):
-        return True if self.id == other.id else False
 
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, eq=False)
 class MatchedOrder:
     buy_trader_id: int
     sell_trader_id: int
@@ -42,10 +43,6 @@ class MatchedOrder:
     quantity: int
     id: Optional[Union[int, AnyStr]] = None
 
-    def __post_init__(self):
-        self.id = uuid.uuid4().hex if self.id is None else self.id
-
-    @property
     def as_dict(self) -> Dict:
         return {
             "Id": self.id,
@@ -54,6 +51,3 @@ class MatchedOrder:
             "Quantity": self.quantity,
             "Price": self.price,
         }
-
-    def __eq__(self, other):
-        return True if self.id == other.id else False
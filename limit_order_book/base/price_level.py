@@ -0,0 +1,114 @@
+from typing import Dict, Iterator
+
+from .order import LimitOrder
+
+
+class PriceLevel:
+    """Intrusive doubly linked list of the limit orders at a price level.
+
+    The orders are chained together through their own `prev` and `next`
+    fields, from `head`, the oldest order, to `tail`, the newest order. Given
+    the order itself, removing it from anywhere in the queue is then O(1)
+    rather than a linear scan as with `collections.deque.remove`.
+
+    The total outstanding quantity of the orders is kept up to date in
+    `total_quantity` as orders are added and removed, such that summarising
+    a price level does not visit each of its orders. An order amended in
+    place while in the queue must also be deducted from `total_quantity` by
+    the caller.
+    """
+
+    __slots__ = ("price", "head", "tail", "size", "total_quantity")
+
+    def __init__(self, price: int) -> None:
+        self.price = price
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.total_quantity = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[LimitOrder]:
+        order = self.head
+        while order is not None:
+            yield order
+            order = order.next
+
+    def append(self, order: LimitOrder) -> None:
+        """Append an order to the back of the queue."""
+        last = self.tail
+        order.prev = last
+        order.next = None
+
+        if last is None:
+            self.head = order
+        else:
+            last.next = order
+        self.tail = order
+
+        self.size += 1
+        self.total_quantity += order.quantity
+
+    def appendleft(self, order: LimitOrder) -> None:
+        """Insert an order at the front of the queue."""
+        first = self.head
+        order.prev = None
+        order.next = first
+
+        if first is None:
+            self.tail = order
+        else:
+            first.prev = order
+        self.head = order
+
+        self.size += 1
+        self.total_quantity += order.quantity
+
+    def popleft(self) -> LimitOrder:
+        """Remove and return the order at the front of the queue."""
+        order = self.head
+        if order is None:
+            raise IndexError("pop from an empty price level")
+
+        self.head = order.next
+        if self.head is None:
+            self.tail = None
+        else:
+            self.head.prev = None
+        order.next = None
+
+        self.size -= 1
+        self.total_quantity -= order.quantity
+        return order
+
+    def remove(self, order: LimitOrder) -> None:
+        """Unlink the given order from the queue."""
+        before = order.prev
+        after = order.next
+
+        if before is None:
+            if self.head is not order:
+                raise ValueError("order is not in the price level")
+            self.head = after
+        else:
+            before.next = after
+
+        if after is None:
+            self.tail = before
+        else:
+            after.prev = before
+
+        order.prev = None
+        order.next = None
+
+        self.size -= 1
+        self.total_quantity -= order.quantity
+
+    def as_dict(self) -> Dict:
+        return {
+            "Price": self.price,
+            "Quantity": self.total_quantity,
+            "NumOrders": self.size,
+        }
@@ -3,6 +3,10 @@ from rich import box
 from rich.table import Table
 from rich.console import Console, RenderableType
 
+# Console shared by all calls to `repr_rich`, such that the terminal is not
+# detected again on every call
+_CONSOLE = Console()
+
 
 def df_to_rich_table(
         df: pandas.DataFrame,
@@ -42,21 +46,19 @@ def df_to_rich_table(
         rich_table.add_column(column)
 
     if len(df) > max_rows:
-        head = df.head(max_rows // 2)
-        tail = df.tail(max_rows // 2)
+        # Add the head and tail of the DataFrame with a row of '...' in
+        # between, rather than building a new DataFrame to display
+        for row in df.head(max_rows // 2).itertuples(index=False):
+            rich_table.add_row(*map(str, row))
 
-        data_for_display = pandas.concat([
-            head,
-            pandas.DataFrame(data=[{col: '...' for col in df.columns}]),
-            tail]
-        )
+        rich_table.add_row(*["..."] * len(df.columns))
 
-    else:
-        data_for_display = df
+        for row in df.tail(max_rows // 2).itertuples(index=False):
+            rich_table.add_row(*map(str, row))
 
-    for index, value_list in enumerate(data_for_display.values.tolist()):
-        row = [str(x) for x in value_list]
-        rich_table.add_row(*row)
+    else:
+        for row in df.itertuples(index=False):
+            rich_table.add_row(*map(str, row))
 
     return rich_table
 
@@ -64,7 +66,8 @@ def df_to_rich_table(
 def repr_rich(renderable: RenderableType) -> str:
     """Renders a rich object to a string
 
-    It implements one of the methods of capturing output listed here
+    It implements one of the methods of capturing output listed here,
+    reusing a single console rather than constructing one per call
 
     https://rich.readthedocs.io/en/stable/console.html#capturing-output
 
@@ -78,8 +81,7 @@ def repr_rich(renderable: RenderableType) -> str:
     AnyStr
         The string representation of the rich object
     """
-    console = Console()
-    with console.capture() as capture:
-        console.print(renderable)
+    with _CONSOLE.capture() as capture:
+        _CONSOLE.print(renderable)
     str_output = capture.get()
     return str_output
@@ -1 +1 @@
-from .base import load_msft_orders
+from .base import load_msft_orders, load_msft_orders_arrays, replay_orders
@@ -1,10 +1,20 @@
+import functools
+import numpy
 import pandas
+import pyarrow
+import pyarrow.parquet
 from importlib import resources
+from typing import Dict
+
+from limit_order_book.base import BaseLimitOrderBook, Direction
 
 
 def load_msft_orders() -> pandas.DataFrame:
     """Load MSFT limit order data
 
+    The sample file is only read and decompressed on the first call, later
+    calls convert the cached Arrow table to a new DataFrame.
+
     This dataset contains limit orders from a sample file provided by LOBSTER
     for the ticker MSFT on 2012-06-21.
 
@@ -54,7 +64,110 @@ def load_msft_orders() -> pandas.DataFrame:
     ----------
     . https://lobsterdata.com/info/DataSamples.php
     """
+    return _read_msft_table().to_pandas()
+
+
+def load_msft_orders_arrays() -> Dict[str, numpy.ndarray]:
+    """Load MSFT limit order data as numpy arrays
+
+    The same dataset as `load_msft_orders`, returned as a numpy array for
+    each column rather than a DataFrame, such that the columns can be passed
+    straight to a batch method such as `add_batch` without going through
+    pandas. The arrays are fresh copies, so may be modified by the caller.
+
+    Returns
+    -------
+    Dict[str, numpy.ndarray]
+        The columns of the sample limit order data keyed by name.
+
+    Examples
+    --------
+    >>> from limit_order_book.datasets import load_msft_orders_arrays
+    >>> arrays = load_msft_orders_arrays()
+    >>> arrays["Price"][:5]
+    array([310400, 310500, 310400, 310500, 310600])
+    """
+    table = _read_msft_table()
+
+    return {
+        name: column.to_numpy()
+        for name, column in zip(table.column_names, table.columns)
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _read_msft_table() -> pyarrow.Table:
+    """Read the MSFT sample file into an Arrow table, once per process."""
     fname = "MSFT_2012-06-21_34200000_37800000_message_50.csv.pq"
     path = resources.files("limit_order_book.datasets.data").joinpath(fname)
 
-    return pandas.read_parquet(path)
+    return pyarrow.parquet.read_table(path)
+
+
+def replay_orders(
+        limit_order_book: BaseLimitOrderBook,
+        df: pandas.DataFrame,
+        trader_id: int = 1) -> None:
+    """Replay LOBSTER order messages through a limit order book
+
+    Submissions of new limit orders (type 1) are added to the book with the
+    order reference number as order identifier, and deletions (type 3)
+    cancel the order if it is still resting in the book. All other events
+    are skipped, as the book matches orders itself and does not support
+    partial cancellation.
+
+    The columns are extracted from the DataFrame once, and each run of
+    submissions between two deletions is added with a single call to
+    `add_many`, such that a book with a compiled matching loop processes the
+    whole run in one call.
+
+    Parameters
+    ----------
+    limit_order_book: BaseLimitOrderBook
+        The limit order book to replay the messages through.
+    df: pandas.DataFrame
+        The LOBSTER messages, see `load_msft_orders`.
+    trader_id: int
+        The trader identifier of all orders.
+
+    Examples
+    --------
+    >>> from limit_order_book import ArrayArenaLimitOrderBook
+    >>> from limit_order_book.datasets import load_msft_orders, replay_orders
+    >>> df = load_msft_orders()
+    >>> max_price = df.loc[df["Type"] == 1, "Price"].max() + 1
+    >>> lob = ArrayArenaLimitOrderBook("MSFT", max_price)
+    >>> replay_orders(lob, df)
+    """
+    types, order_ids, sizes, prices, directions = (
+        df[["Type", "OrderID", "Size", "Price", "Direction"]]
+        .to_numpy(dtype=numpy.int64)
+        .T
+    )
+    directions = numpy.where(
+        directions == 1, Direction.Buy.value, Direction.Sell.value
+    )
+    is_submission = types == 1
+    start = 0
+
+    for stop in numpy.append(numpy.flatnonzero(types == 3), len(df)).tolist():
+        # Add the submissions since the last deletion in one batch
+        idx = start + numpy.flatnonzero(is_submission[start:stop])
+
+        if len(idx) > 0:
+            limit_order_book.add_many(
+                trader_ids=numpy.full(len(idx), trader_id, dtype=numpy.int64),
+                directions=directions[idx],
+                quantities=sizes[idx],
+                prices=prices[idx],
+                order_ids=order_ids[idx],
+            )
+
+        if stop < len(df):
+            try:
+                limit_order_book.cancel(int(order_ids[stop]))
+            except (KeyError, ValueError):
+                # Order was submitted before the sample or has been filled
+                pass
+
+        start = stop + 1
@@ -1,3 +1,4 @@
 from .array_deque import ArrayDequeLimitOrderBook
 from .balanced_tree import BalancedTreeDequeLimitOrderBook
 from .hash_deque import HashDequeLimitOrderBook
+from .sorted_dict_deque import SortedDictDequeLimitOrderBook
@@ -1,16 +1,32 @@
+import numpy
 from typing import AnyStr
 
-from limit_order_book.base import PriceDeque, LimitOrder
+from limit_order_book.base import PriceLevel, LimitOrder
+from limit_order_book.base.bitset import (
+    clear_bit,
+    next_set_bit,
+    prev_set_bit,
+    set_bit,
+)
 from .base_deque_limit_order_book import BaseDequeLimitOrderBook
 
 
 class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
     """A flat linear array implementation of a limit order book.
 
-    This implementation utilises a flat vector to look up the price deque for a
-    given price level. Note that a price deque is instantiated at each price
-    level and the best bid/ask prices are updated via the private attributes
-    `bid_max` and `ask_min`.
+    This implementation utilises a flat vector to look up the price level for a
+    given price. Note that a price level is only instantiated at a price once
+    an order is queued there, and the best bid/ask prices are updated via the
+    private attributes `bid_max` and `ask_min`. The orders at each price level
+    are queued in an intrusive doubly linked list, see `PriceLevel`, such that
+    cancelling an order unlinks it in O(1).
+
+    Rather than stepping over empty price levels one at a time, the next and
+    previous non-empty price levels are found from a bitset with a bit set
+    for each price level an order has been queued at, searched 64 price
+    levels at a time by the compiled helpers of `limit_order_book.base.bitset`.
+    The bits of price levels emptied by matching or cancellation are only
+    cleared when a search comes across them.
 
     References
     ----------
@@ -22,10 +38,13 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
         super().__init__(name, max_price)
         self.bid_max = 0
         self.ask_min = max_price
-        self.price_queues = [
-            PriceDeque(iterable=[], price=price)
-            for price in range(self.max_price + 1)
-        ]
+        self.price_queues = [None] * (self.max_price + 1)
+
+        n_words = max_price // 64 + 1
+        self._active_bits = numpy.zeros(n_words, dtype=numpy.uint64)
+        self._active_summary = numpy.zeros(
+            n_words // 64 + 1, dtype=numpy.uint64
+        )
 
     def _add_order_to_queue(self, limit_order: LimitOrder) -> None:
         """Add order to price queue
@@ -36,10 +55,21 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
             The limit order to add
         """
         self.orders[limit_order.id] = limit_order
-        self._get_price_level(limit_order.price).append(limit_order)
 
-    def _get_price_level(self, price: int) -> PriceDeque:
-        """Returns the price queue for the given price
+        level = self.price_queues[limit_order.price]
+
+        if level is None:
+            level = PriceLevel(price=limit_order.price)
+            self.price_queues[limit_order.price] = level
+
+        if not level:
+            set_bit(
+                self._active_bits, self._active_summary, limit_order.price
+            )
+        level.append(limit_order)
+
+    def _get_price_level(self, price: int) -> PriceLevel:
+        """Returns the price level for the given price
 
         Parameters
         ----------
@@ -48,10 +78,11 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
 
         Returns
         -------
-        PriceDeque
-            The PriceQueue for the given price level
+        PriceLevel
+            The PriceLevel for the given price
         """
-        return self.price_queues[price]
+        level = self.price_queues[price]
+        return PriceLevel(price=price) if level is None else level
 
     def _get_next_level(self, price: int) -> int:
         """Returns the next highest price level
@@ -66,16 +97,18 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
         int
             The next highest price level
         """
+        price_queues = self.price_queues
+        bits, summary = self._active_bits, self._active_summary
+        max_price = self.max_price
 
-        price += 1
+        while True:
+            price = next_set_bit(bits, summary, price, max_price)
 
-        while (
-                (len(self._get_price_level(price)) == 0) and
-                (price < self.max_price)
-        ):
-            price += 1
+            if price >= max_price or price_queues[price]:
+                return price
 
-        return price
+            # The price level has since been emptied, clear its bit
+            clear_bit(bits, summary, price)
 
     def _get_prev_level(self, price: int) -> int:
         """Returns the previous highest price level
@@ -90,12 +123,17 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
         int
             The previous highest price level
         """
-        price -= 1
+        price_queues = self.price_queues
+        bits, summary = self._active_bits, self._active_summary
+
+        while True:
+            price = prev_set_bit(bits, summary, price)
 
-        while (len(self._get_price_level(price)) == 0) and (price > 0):
-            price -= 1
+            if price <= 0 or price_queues[price]:
+                return price
 
-        return price
+            # The price level has since been emptied, clear its bit
+            clear_bit(bits, summary, price)
 
     def _update_best_ask_price(self, price=None):
         """Update the best ask price
@@ -112,9 +150,10 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
             updating the best ask price otherwise the current best ask price
             will be used.
         """
-        starting_price = min([price, self.best_ask]) if price else self.best_ask
+        ask_min = self.ask_min
+        starting_price = price if price and price < ask_min else ask_min
 
-        if len(self._get_price_level(starting_price)) != 0:
+        if self.price_queues[starting_price]:
             self.ask_min = starting_price
         else:
             self.ask_min = self._get_next_level(starting_price)
@@ -134,9 +173,10 @@ class ArrayDequeLimitOrderBook(BaseDequeLimitOrderBook):
             will be used.
         """
 
-        starting_price = max([price, self.best_bid]) if price else self.best_bid
+        bid_max = self.bid_max
+        starting_price = price if price and price > bid_max else bid_max
 
-        if len(self._get_price_level(starting_price)) != 0:
+        if self.price_queues[starting_price]:
             self.bid_max = starting_price
         else:
             self.bid_max = self._get_prev_level(starting_price)
@@ -2,7 +2,7 @@ from bintrees import FastAVLTree
 from typing import AnyStr
 
 from limit_order_book.base import (
-    PriceDeque,
+    PriceLevel,
     LimitOrder,
     Direction
 )
@@ -13,9 +13,26 @@ from .base_deque_limit_order_book import BaseDequeLimitOrderBook
 class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
     """A balanced tree implementation of a limit order book.
 
-    This implementation utilises a balanced tree to look up the price deque
-    for a given price level. Note that empty price levels are deleted from
-    the tree when the best bid/ask price is updated.
+    This implementation utilises a balanced tree to look up the price level
+    for a given price. Note that empty price levels are deleted from the tree
+    once the matching loop comes across them.
+
+    The tree is only used to step between price levels in price order. The
+    price levels are also indexed by price in a dictionary for each side, so
+    looking up the price level at a given price is a single hash lookup
+    rather than a walk down the tree.
+
+    Rather than a deque, the orders at each price level are queued in an
+    intrusive doubly linked list, see `PriceLevel`, such that cancelling an
+    order unlinks it in O(1) wherever it is in the queue.
+
+    See `SortedDictDequeLimitOrderBook` for the equivalent book with the
+    price levels held in a `sortedcontainers.SortedDict` instead.
+
+    The best bid and ask prices are cached, and only looked up in the tree
+    again when the price level at the top of the book is deleted, such that
+    reading them is a single attribute load rather than a walk down to the
+    first or last node of the tree.
 
     References
     ----------
@@ -27,6 +44,153 @@ class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
         super().__init__(name, max_price)
         self._bids = FastAVLTree()
         self._asks = FastAVLTree()
+        self._bid_levels = dict()
+        self._ask_levels = dict()
+        self._best_bid = 0
+        self._best_ask = max_price
+
+    def _add_buy(self, limit_order: LimitOrder) -> None:
+        """Match a buy order against the asks, enqueueing any unfilled
+        quantity in the book.
+
+        The price levels are read straight from the level dictionary and
+        tree, rather than through `_get_price_level` and `best_ask`.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The buy order to add to the book
+        """
+        asks = self._asks
+        ask_levels = self._ask_levels
+        record_match = self._record_match
+        orders = self.orders
+        price = limit_order.price
+        trader_id = limit_order.trader_id
+        quantity = limit_order.quantity
+
+        # Look for outstanding sell orders that cross with the buy order
+        best_ask = self._best_ask
+        entries = ask_levels.get(best_ask) if price >= best_ask else None
+
+        while entries is not None:
+            # Iterate through limit orders at current level
+            popleft = entries.popleft
+
+            while entries:
+                entry = entries.head
+                resting = entry.quantity
+                fill = resting if resting < quantity else quantity
+                quantity -= fill
+
+                if resting > fill:
+                    # Amend existing order in order book
+                    entry.quantity -= fill
+                    entries.total_quantity -= fill
+                else:
+                    # Remove existing order from order book
+                    popleft()
+                    del orders[entry.id]
+
+                record_match(trader_id, entry.trader_id, fill, entry.price)
+
+                if quantity == 0:
+                    # Order completely matched, done
+                    limit_order.quantity = 0
+                    return None
+
+            # Exhausted all orders at the current price level, move to the
+            # next price level
+            asks.remove(best_ask)
+            del ask_levels[best_ask]
+
+            if asks.is_empty():
+                self._best_ask = self.max_price
+                break
+
+            # Fetch the next price level together with its price from the
+            # tree, rather than looking it up again by price
+            best_ask, entries = asks.min_item()
+            self._best_ask = best_ask
+
+            if price < best_ask:
+                break
+
+        # If we get here, then there is some quantity we cannot fill, so we
+        # enqueue the order in the limit order book
+        limit_order.quantity = quantity
+        self._add_order_to_queue(limit_order)
+
+    def _add_sell(self, limit_order: LimitOrder) -> None:
+        """Match a sell order against the bids, enqueueing any unfilled
+        quantity in the book.
+
+        See `_add_buy`.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The sell order to add to the book
+        """
+        bids = self._bids
+        bid_levels = self._bid_levels
+        record_match = self._record_match
+        orders = self.orders
+        price = limit_order.price
+        trader_id = limit_order.trader_id
+        quantity = limit_order.quantity
+
+        # Look for outstanding buy orders that cross with the sell order
+        best_bid = self._best_bid
+        entries = bid_levels.get(best_bid) if price <= best_bid else None
+
+        while entries is not None:
+            # Iterate through limit orders at current level
+            popleft = entries.popleft
+
+            while entries:
+                entry = entries.head
+                resting = entry.quantity
+                fill = resting if resting < quantity else quantity
+                quantity -= fill
+
+                if resting > fill:
+                    # Amend existing order in order book
+                    entry.quantity -= fill
+                    entries.total_quantity -= fill
+                else:
+                    # Remove existing order from order book
+                    popleft()
+                    del orders[entry.id]
+
+                record_match(entry.trader_id, trader_id, fill, entry.price)
+
+                if quantity == 0:
+                    # Order completely matched, done
+                    limit_order.quantity = 0
+                    return None
+
+            # Exhausted all orders at the current price level, move to the
+            # next price level
+            bids.remove(best_bid)
+            del bid_levels[best_bid]
+
+            if bids.is_empty():
+                self._best_bid = 0
+                break
+
+            # Fetch the next price level together with its price from the
+            # tree, rather than looking it up again by price
+            best_bid, entries = bids.max_item()
+            self._best_bid = best_bid
+
+            if price > best_bid:
+                break
+
+        # If we get here, then there is some quantity we cannot fill, so we
+        # enqueue the order in the limit order book
+        limit_order.quantity = quantity
+        self._add_order_to_queue(limit_order)
 
     def _add_order_to_queue(self, limit_order: LimitOrder) -> None:
         """Add order to price queue
@@ -38,23 +202,31 @@ class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
         """
         self.orders[limit_order.id] = limit_order
 
-        book = (
-            self._bids if limit_order.direction == Direction.Buy else self._asks
-        )
+        if limit_order.direction == Direction.Buy:
+            book, levels = self._bids, self._bid_levels
+        else:
+            book, levels = self._asks, self._ask_levels
+
+        level = levels.get(limit_order.price)
+
+        if level is None:
+            # Create price level with limit order
+            level = PriceLevel(price=limit_order.price)
+            level.append(limit_order)
+            book.insert(limit_order.price, level)
+            levels[limit_order.price] = level
 
-        if limit_order.price not in book:
-            # Create deque with limit order
-            book.insert(
-                limit_order.price,
-                PriceDeque(price=limit_order.price, iterable=[limit_order])
-            )
+            if limit_order.direction == Direction.Buy:
+                self._best_bid = max(self._best_bid, limit_order.price)
+            else:
+                self._best_ask = min(self._best_ask, limit_order.price)
 
         else:
-            # Append limit order to existing deque
-            book.get_value(limit_order.price).append(limit_order)
+            # Append limit order to existing price level
+            level.append(limit_order)
 
-    def _get_price_level(self, price: int) -> PriceDeque:
-        """Returns the price queue for the given price
+    def _get_price_level(self, price: int) -> PriceLevel:
+        """Returns the price level for the given price
 
         Parameters
         ----------
@@ -63,15 +235,18 @@ class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
 
         Returns
         -------
-        PriceDeque
-            The PriceQueue for the given price level
+        PriceLevel
+            The PriceLevel for the given price
         """
-        book = self._bids if price <= self.best_bid else self._asks
+        levels = (
+            self._bid_levels if price <= self.best_bid else self._ask_levels
+        )
+        level = levels.get(price)
 
-        if price not in book:
-            return PriceDeque(price=price)
+        if level is None:
+            return PriceLevel(price=price)
         else:
-            return book.get_value(price)
+            return level
 
     def _get_next_level(self, price: int) -> int:
         """Returns the next highest price level
@@ -115,44 +290,6 @@ class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
             book = self._bids if price <= self.best_bid else self._asks
             return book.prev_item(price)[0]
 
-    def _update_best_ask_price(self, price=None):
-        """Update the best ask price
-
-        For the given reference ask price, check if the price deque is empty.
-        If so, delete the node from the balanced tree.
-
-        Parameters
-        ----------
-        price: Optional[int]
-            If provided, this value will be used as the reference point for
-            updating the best ask price, otherwise the current best ask price
-            will be used.
-        """
-
-        """Update the best ask price."""
-        level = self.best_ask if price is None else price
-        if len(self._get_price_level(level)) == 0:
-            self._asks.remove(level)
-
-    def _update_best_bid_price(self, price=None):
-        """Update the best bid price
-
-        For the given reference bid price, check if the price deque is empty.
-        If so, delete the node from the balanced tree.
-
-        Parameters
-        ----------
-        price: Optional[int]
-            If provided, this value will be used as the reference point for
-            updating the best bid price, otherwise the current best bid price
-            will be used.
-        """
-
-        """Update the best bid price."""
-        level = self.best_bid if price is None else price
-        if len(self._get_price_level(level)) == 0:
-            self._bids.remove(level)
-
     @property
     def best_bid(self) -> int:
         """The current best bid price
@@ -162,10 +299,7 @@ class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
         int
             The current best bid price
         """
-        if self._bids.is_empty():
-            return 0
-        else:
-            return self._bids.max_item()[0]
+        return self._best_bid
 
     @property
     def best_ask(self) -> int:
@@ -176,7 +310,4 @@ class BalancedTreeDequeLimitOrderBook(BaseDequeLimitOrderBook):
         int
             The current best ask price
         """
-        if self._asks.is_empty():
-            return self.max_price
-        else:
-            return self._asks.min_item()[0]
+        return self._best_ask
@@ -1,12 +1,12 @@
+import itertools
+import numpy
 import pandas
-from typing import AnyStr, Optional
+from typing import AnyStr, Iterable, Iterator, Optional
 
 from limit_order_book.base import (
     BaseLimitOrderBook,
-    PriceDeque,
-    LimitOrder,
-    MatchedOrder,
-    Direction
+    PriceLevel,
+    LimitOrder
 )
 
 
@@ -16,24 +16,30 @@ class BaseDequeLimitOrderBook(BaseLimitOrderBook):
     This flavour of implementation utilises a double-ended queue at each price
     level to keep track of limit orders in chronological order. Another data
     structure is used to enable efficient lookup of the double-ended queues.
+    The orders resting in the book are held by identifier in `orders`, and
+    are dropped from it once filled or cancelled.
 
     See Also
     --------
     .. ArrayDequeLimitOrderBook
     .. HashDequeLimitOrderBook
     .. BalancedTreeDequeLimitOrderBook
+    .. SortedDictDequeLimitOrderBook
     """
 
     def __init__(self, name: AnyStr, max_price: int) -> None:
         super().__init__(name, max_price)
         self.orders = dict()
 
+        # Matching loop for each side, indexed by the value of `Direction`
+        self._add_side = (self._add_buy, self._add_sell)
+
     def _add_order_to_queue(self, limit_order: LimitOrder) -> None:
         """Add order to queue"""
         raise NotImplementedError
 
-    def _get_price_level(self, price: int) -> PriceDeque:
-        """Returns PriceDeque for the given price."""
+    def _get_price_level(self, price: int) -> PriceLevel:
+        """Returns PriceLevel for the given price."""
         raise NotImplementedError
 
     def _get_next_level(self, price: int) -> int:
@@ -70,129 +76,131 @@ class BaseDequeLimitOrderBook(BaseLimitOrderBook):
         limit_order: LimitOrder
             The limit order to add to the book
         """
+        self._assign_order_id(limit_order)
+        self._add_side[limit_order.direction](limit_order)
+
+    def _add_buy(self, limit_order: LimitOrder) -> None:
+        """Match a buy order against the asks, enqueueing any unfilled
+        quantity in the book.
+
+        The attributes and methods used by the matching loop are bound to
+        locals up front, such that they are not looked up again for every
+        resting order matched. The best price is likewise held in a local and
+        only refreshed once a price level is exhausted.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The buy order to add to the book
+        """
+        record_match = self._record_match
+        orders = self.orders
+        price = limit_order.price
+        trader_id = limit_order.trader_id
+        quantity = limit_order.quantity
+
+        # Look for outstanding sell orders that cross with the buy order
+        best_ask = self.best_ask
+        while price >= best_ask:
+
+            # Iterate through limit orders at current level
+            entries = self._get_price_level(best_ask)
+            popleft = entries.popleft
+
+            while entries:
+                entry = entries.head
+                resting = entry.quantity
+                fill = resting if resting < quantity else quantity
+                quantity -= fill
+
+                if resting > fill:
+                    # Amend existing order in order book
+                    entry.quantity -= fill
+                    entries.total_quantity -= fill
+                else:
+                    # Remove existing order from order book
+                    popleft()
+                    del orders[entry.id]
+
+                record_match(trader_id, entry.trader_id, fill, entry.price)
+
+                if quantity == 0:
+                    # Order completely matched, done
+                    limit_order.quantity = 0
+                    return None
+
+            # Exhausted all orders at the current price level, move to the
+            # next price level
+            self._update_best_ask_price()
+            best_ask = self.best_ask
+
+        # If we get here, then there is some quantity we cannot fill, so we
+        # enqueue the order in the limit order book
+        limit_order.quantity = quantity
+        self._add_order_to_queue(limit_order)
+
+        # Update bid max
+        self._update_best_bid_price(price)
+
+    def _add_sell(self, limit_order: LimitOrder) -> None:
+        """Match a sell order against the bids, enqueueing any unfilled
+        quantity in the book.
+
+        See `_add_buy`.
 
-        if limit_order.direction == Direction.Buy:
-            # Look for outstanding sell orders that cross with the buy order
-
-            while limit_order.price >= self.best_ask:
-
-                # Iterate through limit orders at current level
-                entries = self._get_price_level(self.best_ask)
-
-                while entries:
-                    entry = entries[0]
-
-                    if entry.quantity < limit_order.quantity:
-                        # Current limit order is larger than best ask order
-                        limit_order.quantity -= entry.quantity
-
-                        # Remove existing order from book
-                        entries.popleft()
-
-                        self.execute(
-                            MatchedOrder(
-                                buy_trader_id=limit_order.trader_id,
-                                sell_trader_id=entry.trader_id,
-                                quantity=entry.quantity,
-                                price=entry.price,
-                            )
-                        )
-
-                    else:
-                        # Existing limit order is larger than current order
-                        if entry.quantity > limit_order.quantity:
-                            # Amend existing order in order book
-                            entry.quantity -= limit_order.quantity
-                        else:
-                            # Remove existing order from order book
-                            entries.popleft()
-
-                        self.execute(
-                            MatchedOrder(
-                                buy_trader_id=limit_order.trader_id,
-                                sell_trader_id=entry.trader_id,
-                                quantity=limit_order.quantity,
-                                price=entry.price,
-                            )
-                        )
-
-                        # Order completely matched, done
-                        return None
-
-                # Exhausted all orders at the current price level, move to
-                # the next price level
-                self._update_best_ask_price()
-
-            # If we get here, then there is some quantity we cannot fill,
-            # so we enqueue the order in the limit order book
-            self._add_order_to_queue(limit_order)
-
-            # Update bid max
-            self._update_best_bid_price(limit_order.price)
-
-            # Done
-            return None
-
-        else:
-            # Sell order
-            while limit_order.price <= self.best_bid:
-
-                # Look for existing sell orders to cross with the buy order
-                entries = self._get_price_level(self.best_bid)
-
-                while entries:
-                    entry = entries[0]
-
-                    if entry.quantity < limit_order.quantity:
-                        # Current limit order is larger than best bid order
-                        limit_order.quantity -= entry.quantity
-
-                        # Remove existing order from book
-                        entries.popleft()
-
-                        self.execute(
-                            MatchedOrder(
-                                buy_trader_id=entry.trader_id,
-                                sell_trader_id=limit_order.trader_id,
-                                quantity=entry.quantity,
-                                price=entry.price,
-                            )
-                        )
-
-                    else:
-                        # Existing limit order is larger than current order
-                        if entry.quantity > limit_order.quantity:
-                            # Amend existing order in order book
-                            entry.quantity -= limit_order.quantity
-                        else:
-                            # Remove existing order from order book
-                            entries.popleft()
-
-                        self.execute(
-                            MatchedOrder(
-                                buy_trader_id=entry.trader_id,
-                                sell_trader_id=limit_order.trader_id,
-                                quantity=limit_order.quantity,
-                                price=entry.price,
-                            )
-                        )
-
-                        # Order completely matched, done
-                        return None
-
-                # Exhausted all orders at the current price level, move
-                # to the next price level
-                self._update_best_bid_price()
-
-            # If we get here, then there is some quantity we cannot fill,
-            # so we enqueue the order in the limit order book
-            self._add_order_to_queue(limit_order)
-
-            # Update ask min
-            self._update_best_ask_price(limit_order.price)
-
-            # Done
-            return None
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The sell order to add to the book
+        """
+        record_match = self._record_match
+        orders = self.orders
+        price = limit_order.price
+        trader_id = limit_order.trader_id
+        quantity = limit_order.quantity
+
+        # Look for outstanding buy orders that cross with the sell order
+        best_bid = self.best_bid
+        while price <= best_bid:
+
+            # Iterate through limit orders at current level
+            entries = self._get_price_level(best_bid)
+            popleft = entries.popleft
+
+            while entries:
+                entry = entries.head
+                resting = entry.quantity
+                fill = resting if resting < quantity else quantity
+                quantity -= fill
+
+                if resting > fill:
+                    # Amend existing order in order book
+                    entry.quantity -= fill
+                    entries.total_quantity -= fill
+                else:
+                    # Remove existing order from order book
+                    popleft()
+                    del orders[entry.id]
+
+                record_match(entry.trader_id, trader_id, fill, entry.price)
+
+                if quantity == 0:
+                    # Order completely matched, done
+                    limit_order.quantity = 0
+                    return None
+
+            # Exhausted all orders at the current price level, move to the
+            # next price level
+            self._update_best_bid_price()
+            best_bid = self.best_bid
+
+        # If we get here, then there is some quantity we cannot fill, so we
+        # enqueue the order in the limit order book
+        limit_order.quantity = quantity
+        self._add_order_to_queue(limit_order)
+
+        # Update ask min
+        self._update_best_ask_price(price)
 
     def cancel(self, order_id: AnyStr) -> None:
         """Cancel limit order with the given order identifier
@@ -212,6 +220,61 @@ class BaseDequeLimitOrderBook(BaseLimitOrderBook):
         # Remove order from order cache
         del self.orders[order_id]
 
+    def _iter_bid_levels(self) -> Iterator[PriceLevel]:
+        """Yields the non-empty bid price levels from the best bid down."""
+        current_level = self.best_bid
+
+        while current_level > 0:
+
+            level = self._get_price_level(current_level)
+
+            # If non-empty, yield
+            if len(level) != 0:
+                yield level
+
+            # Go to previous level
+            current_level = self._get_prev_level(current_level)
+
+    def _iter_ask_levels(self) -> Iterator[PriceLevel]:
+        """Yields the non-empty ask price levels from the best ask up."""
+        current_level = self.best_ask
+
+        while current_level < self.max_price:
+
+            level = self._get_price_level(current_level)
+
+            if len(level) != 0:
+                yield level
+
+            # Go to next level
+            current_level = self._get_next_level(current_level)
+
+    @staticmethod
+    def _levels_as_dataframe(
+            price_levels: Iterable[PriceLevel],
+            levels: int) -> pandas.DataFrame:
+        """Returns a summary of the first `levels` of the given price levels.
+
+        The summary is written column-wise into preallocated arrays, rather
+        than building a dictionary for each price level.
+        """
+        prices = numpy.empty(levels, dtype=numpy.int64)
+        quantities = numpy.empty(levels, dtype=numpy.int64)
+        num_orders = numpy.empty(levels, dtype=numpy.int64)
+        n = 0
+
+        for level in itertools.islice(price_levels, levels):
+            prices[n] = level.price
+            quantities[n] = level.total_quantity
+            num_orders[n] = len(level)
+            n += 1
+
+        return pandas.DataFrame({
+            "Price": prices[:n],
+            "Quantity": quantities[:n],
+            "NumOrders": num_orders[:n],
+        })
+
     def get_top_bids_as_dataframe(self, levels=10) -> pandas.DataFrame:
         """Get a DataFrame summary of top bids in the order book.
 
@@ -225,21 +288,7 @@ class BaseDequeLimitOrderBook(BaseLimitOrderBook):
         pandas.DataFrame
             A pandas DataFrame summary of bids at the top of the book.
         """
-        current_level = self.best_bid
-        data = []
-
-        while len(data) < levels and current_level > 0:
-
-            level = self._get_price_level(current_level)
-
-            # If non-empty, append
-            if len(level) != 0:
-                data.append(level.as_dict())
-
-            # Go to previous level
-            current_level = self._get_prev_level(current_level)
-
-        return pandas.DataFrame(data)
+        return self._levels_as_dataframe(self._iter_bid_levels(), levels)
 
     def get_top_asks_as_dataframe(self, levels=10) -> pandas.DataFrame:
         """Get a DataFrame summary of top asks in the order book.
@@ -254,17 +303,4 @@ class BaseDequeLimitOrderBook(BaseLimitOrderBook):
         pandas.DataFrame
             A pandas.DataFrame summary of asks at the top of the book.
         """
-        current_level = self.best_ask
-        data = []
-
-        while len(data) < levels and current_level < self.max_price:
-
-            level = self._get_price_level(current_level)
-
-            if len(level) != 0:
-                data.append(level.as_dict())
-
-            # Go to next level
-            current_level = self._get_next_level(current_level)
-
-        return pandas.DataFrame(data)
+        return self._levels_as_dataframe(self._iter_ask_levels(), levels)
@@ -1,8 +1,8 @@
-import pandas
-from typing import AnyStr
+import bisect
+from typing import AnyStr, Iterator
 
 from limit_order_book.base import (
-    PriceDeque,
+    PriceLevel,
     LimitOrder,
 )
 
@@ -13,8 +13,21 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
     """A hash-map implementation of a limit order book.
 
     This implementation utilises a hash map / dictionary to look up the price
-    deque for a given price. The best bid/ask prices are updated via the
+    level for a given price. The best bid/ask prices are updated via the
     private attributes `bid_max` and `ask_min`.
+
+    The orders at each price level are queued in an intrusive doubly linked
+    list, see `PriceLevel`, such that cancelling an order unlinks it in O(1)
+    rather than scanning the queue for it.
+
+    Only occupied price levels are held in the dictionary. A sorted index of
+    the occupied prices, `active_prices`, is used to step to the next or
+    previous price level with a binary search rather than probing every
+    price in between. Price levels that have been emptied are pruned from
+    both when they are next stepped from or over. As a pruned level is
+    removed at its known position in the index, its neighbour moves into
+    that position, so stepping over a run of emptied levels takes a single
+    binary search.
     """
 
     def __init__(self, name: AnyStr, max_price: int) -> None:
@@ -22,6 +35,7 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
         self.bid_max = 0
         self.ask_min = max_price
         self.price_queues = dict()
+        self.active_prices = []
 
     def _add_order_to_queue(self, limit_order: LimitOrder) -> None:
         """Add order to price queue
@@ -32,11 +46,29 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
             The limit order to add
         """
         self.orders[limit_order.id] = limit_order
-        self.price_queues.setdefault(limit_order.price, PriceDeque(
-            price=limit_order.price)).append(limit_order)
 
-    def _get_price_level(self, price: int) -> PriceDeque:
-        """Returns the price queue for the given price
+        if limit_order.price not in self.price_queues:
+            self.price_queues[limit_order.price] = PriceLevel(
+                price=limit_order.price
+            )
+            bisect.insort(self.active_prices, limit_order.price)
+
+        self.price_queues[limit_order.price].append(limit_order)
+
+    def _discard_level(self, i: int) -> None:
+        """Remove an empty price level from the book
+
+        Parameters
+        ----------
+        i: int
+            The position of the empty price level in `active_prices`
+        """
+        del self.price_queues[self.active_prices.pop(i)]
+
+    def _locate_level(self, price: int) -> int:
+        """Returns the position of the given price in `active_prices`, or
+        the position it would be inserted at, pruning the price level if it
+        has been emptied.
 
         Parameters
         ----------
@@ -45,10 +77,42 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
 
         Returns
         -------
-        PriceDeque
-            The PriceQueue for the given price level
+        int
+            The position of the first price level in `active_prices` that
+            is no lower than `price` once pruned.
         """
-        return self.price_queues.get(price, PriceDeque(price=price))
+        prices = self.active_prices
+        i = bisect.bisect_left(prices, price)
+
+        if i < len(prices) and prices[i] == price:
+            if len(self.price_queues[price]) == 0:
+                # Stepping from a price level that has just been emptied
+                self._discard_level(i)
+
+        return i
+
+    def _get_price_level(self, price: int) -> PriceLevel:
+        """Returns the price level for the given price
+
+        Note that the cached best bid/ask price is not kept at an occupied
+        price level: once a cancel or an exact fill empties the best level,
+        the best price stays there until the next crossing order steps past
+        it. The matching loop then still finds the emptied level here, as
+        emptied levels are only pruned from `price_queues` when stepped from
+        or over, rather than building an empty `PriceLevel`.
+
+        Parameters
+        ----------
+        price: int
+            The price
+
+        Returns
+        -------
+        PriceLevel
+            The PriceLevel for the given price
+        """
+        level = self.price_queues.get(price)
+        return PriceLevel(price=price) if level is None else level
 
     def _get_next_level(self, price: int) -> int:
         """Returns the next highest price level
@@ -63,15 +127,18 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
         int
             The next highest price level
         """
-        price += 1
+        prices = self.active_prices
+        i = self._locate_level(price)
 
-        while (
-                (len(self._get_price_level(price)) == 0) and
-                (price < self.max_price)
-        ):
-            price += 1
+        if i < len(prices) and prices[i] == price:
+            i += 1
 
-        return price
+        while i < len(prices):
+            if len(self.price_queues[prices[i]]) != 0:
+                return prices[i]
+            self._discard_level(i)
+
+        return self.max_price
 
     def _get_prev_level(self, price: int) -> int:
         """Returns the previous highest price level
@@ -86,15 +153,16 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
         int
             The previous highest price level
         """
-        price -= 1
+        prices = self.active_prices
+        i = self._locate_level(price)
 
-        while (
-                (len(self._get_price_level(price)) == 0) and
-                (price > 0)
-        ):
-            price -= 1
+        while i > 0:
+            i -= 1
+            if len(self.price_queues[prices[i]]) != 0:
+                return prices[i]
+            self._discard_level(i)
 
-        return price
+        return 0
 
     def _update_best_ask_price(self, price=None):
         """Update the best ask price
@@ -111,10 +179,11 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
             updating the best ask price, otherwise the current best ask price
             will be used.
         """
-        starting_price = min([price, self.best_ask]) if price else self.best_ask
+        ask_min = self.ask_min
+        starting_price = price if price and price < ask_min else ask_min
 
         # Update ask_min
-        if len(self._get_price_level(starting_price)) != 0:
+        if self.price_queues.get(starting_price):
             self.ask_min = starting_price
         else:
             self.ask_min = self._get_next_level(starting_price)
@@ -133,14 +202,36 @@ class HashDequeLimitOrderBook(BaseDequeLimitOrderBook):
             updating the best bid price, otherwise the current best bid price
             will be used.
         """
+        bid_max = self.bid_max
+        starting_price = price if price and price > bid_max else bid_max
 
-        starting_price = max([price, self.best_bid]) if price else self.best_bid
-
-        if len(self._get_price_level(starting_price)) != 0:
+        if self.price_queues.get(starting_price):
             self.bid_max = starting_price
         else:
             self.bid_max = self._get_prev_level(starting_price)
 
+    def _iter_bid_levels(self) -> Iterator[PriceLevel]:
+        """Yields the non-empty bid price levels from the best bid down,
+        walking `active_prices` from a single binary search."""
+        prices = self.active_prices
+        price_queues = self.price_queues
+
+        for i in range(bisect.bisect_right(prices, self.bid_max) - 1, -1, -1):
+            level = price_queues[prices[i]]
+            if level:
+                yield level
+
+    def _iter_ask_levels(self) -> Iterator[PriceLevel]:
+        """Yields the non-empty ask price levels from the best ask up,
+        walking `active_prices` from a single binary search."""
+        prices = self.active_prices
+        price_queues = self.price_queues
+
+        for i in range(bisect.bisect_left(prices, self.ask_min), len(prices)):
+            level = price_queues[prices[i]]
+            if level:
+                yield level
+
     @property
     def best_bid(self) -> int:
         """The current best bid price
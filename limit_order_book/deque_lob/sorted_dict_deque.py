@@ -0,0 +1,238 @@
+import pandas
+from sortedcontainers import SortedDict
+from typing import AnyStr
+
+from limit_order_book.base import (
+    PriceLevel,
+    LimitOrder,
+    Direction
+)
+
+from .base_deque_limit_order_book import BaseDequeLimitOrderBook
+
+
+class SortedDictDequeLimitOrderBook(BaseDequeLimitOrderBook):
+    """A sparse sorted dictionary implementation of a limit order book.
+
+    This implementation keeps the price levels of the bids and asks in two
+    sorted dictionaries keyed by price, such that memory scales with the
+    number of active price levels rather than `max_price`. Empty price levels
+    are deleted as soon as they are exhausted or cancelled, so the best
+    bid/ask prices are always the last/first key and an incoming order only
+    visits the price levels it crosses.
+
+    The orders at each price level are queued in an intrusive doubly linked
+    list, see `PriceLevel`, such that cancelling an order unlinks it in O(1)
+    rather than scanning the queue for it.
+
+    References
+    ----------
+    . https://grantjenks.com/docs/sortedcontainers/sorteddict.html
+    . https://web.archive.org/web/20110219163448/http://howtohft.wordpress.com/2011/02/15/how-to-build-a-fast-limit-order-book/
+    """
+
+    def __init__(self, name: AnyStr, max_price: int) -> None:
+        super().__init__(name, max_price)
+        self._bids = SortedDict()
+        self._asks = SortedDict()
+
+    def _add_buy(self, limit_order: LimitOrder) -> None:
+        """Match a buy order against the asks, enqueueing any unfilled
+        quantity in the book.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The buy order to add to the book
+        """
+        # Look for outstanding sell orders that cross with the buy order
+        self._consume_levels(
+            limit_order,
+            self._asks,
+            self._asks.irange(maximum=limit_order.price),
+        )
+
+        if limit_order.quantity > 0:
+            # If we get here, then there is some quantity we cannot fill,
+            # so we enqueue the order in the limit order book
+            self._add_order_to_queue(limit_order)
+
+    def _add_sell(self, limit_order: LimitOrder) -> None:
+        """Match a sell order against the bids, enqueueing any unfilled
+        quantity in the book.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The sell order to add to the book
+        """
+        # Look for outstanding buy orders that cross with the sell order
+        self._consume_levels(
+            limit_order,
+            self._bids,
+            self._bids.irange(minimum=limit_order.price, reverse=True),
+        )
+
+        if limit_order.quantity > 0:
+            # If we get here, then there is some quantity we cannot fill,
+            # so we enqueue the order in the limit order book
+            self._add_order_to_queue(limit_order)
+
+    def _consume_levels(
+            self, limit_order: LimitOrder, book: SortedDict, prices) -> None:
+        """Match a limit order against the given price levels in order
+
+        The attributes and methods used by the matching loop are bound to
+        locals up front, such that they are not looked up again for every
+        resting order matched.
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The incoming limit order, its quantity is reduced by the quantity
+            matched.
+        book: SortedDict
+            The opposite side of the book.
+        prices: Iterable[int]
+            The prices of the levels of `book` that cross with the order,
+            from the best price outwards.
+        """
+        is_buy = limit_order.direction == Direction.Buy
+        record_match = self._record_match
+        orders = self.orders
+        trader_id = limit_order.trader_id
+        quantity = limit_order.quantity
+        exhausted = []
+
+        for price in prices:
+            entries = book[price]
+            popleft = entries.popleft
+
+            while entries and quantity > 0:
+                entry = entries.head
+                resting = entry.quantity
+                fill = resting if resting < quantity else quantity
+                quantity -= fill
+
+                if resting > fill:
+                    # Amend existing order in order book
+                    entry.quantity -= fill
+                    entries.total_quantity -= fill
+                else:
+                    # Remove existing order from order book
+                    popleft()
+                    del orders[entry.id]
+
+                if is_buy:
+                    record_match(trader_id, entry.trader_id, fill, price)
+                else:
+                    record_match(entry.trader_id, trader_id, fill, price)
+
+            if not entries:
+                exhausted.append(price)
+
+            if quantity == 0:
+                break
+
+        limit_order.quantity = quantity
+
+        # Delete exhausted price levels once done iterating over the book
+        for price in exhausted:
+            del book[price]
+
+    def _add_order_to_queue(self, limit_order: LimitOrder) -> None:
+        """Add order to price queue
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The limit order to add
+        """
+        self.orders[limit_order.id] = limit_order
+
+        is_buy = limit_order.direction == Direction.Buy
+        book = self._bids if is_buy else self._asks
+        level = book.get(limit_order.price)
+
+        if level is None:
+            # Create price level for the limit order
+            level = PriceLevel(price=limit_order.price)
+            book[limit_order.price] = level
+
+        level.append(limit_order)
+
+    def cancel(self, order_id: AnyStr) -> None:
+        """Cancel limit order with the given order identifier
+
+        Parameters
+        ----------
+        order_id: AnyStr
+            Deletes the limit order with the order identifier from the book
+        """
+        # Fetch order
+        limit_order = self.orders[order_id]
+        is_buy = limit_order.direction == Direction.Buy
+        book = self._bids if is_buy else self._asks
+
+        # Remove limit order from book, deleting the price level if empty
+        level = book[limit_order.price]
+        level.remove(limit_order)
+        if not level:
+            del book[limit_order.price]
+
+        # Remove order from order cache
+        del self.orders[order_id]
+
+    @property
+    def best_bid(self) -> int:
+        """The current best bid price
+
+        Returns
+        -------
+        int
+            The current best bid price
+        """
+        return self._bids.peekitem(-1)[0] if self._bids else 0
+
+    @property
+    def best_ask(self) -> int:
+        """The current best ask price
+
+        Returns
+        -------
+        int
+            The current best ask price
+        """
+        return self._asks.peekitem(0)[0] if self._asks else self.max_price
+
+    def get_top_bids_as_dataframe(self, levels=10) -> pandas.DataFrame:
+        """Get a DataFrame summary of top bids in the order book.
+
+        Parameters
+        ----------
+        levels: int
+            The number of price levels to include in the table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas DataFrame summary of bids at the top of the book.
+        """
+        return self._levels_as_dataframe(
+            reversed(self._bids.values()), levels
+        )
+
+    def get_top_asks_as_dataframe(self, levels=10) -> pandas.DataFrame:
+        """Get a DataFrame summary of top asks in the order book.
+
+        Parameters
+        ----------
+        levels: int
+            The number of price levels to include in the table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas.DataFrame summary of asks at the top of the book.
+        """
+        return self._levels_as_dataframe(self._asks.values(), levels)
@@ -0,0 +1 @@
+from .sorted_order_list import SortedOrderListLimitOrderBook
@@ -0,0 +1,196 @@
+import itertools
+import numpy
+import operator
+import pandas
+from sortedcontainers import SortedList
+from typing import AnyStr
+
+from limit_order_book.base import (
+    BaseLimitOrderBook,
+    LimitOrder,
+    Direction,
+)
+
+
+class SortedOrderListLimitOrderBook(BaseLimitOrderBook):
+    """A limit order book without price levels.
+
+    Rather than a queue of orders at each price level, the resting orders on
+    each side of the book are kept in a single sorted list ordered by price
+    and then time priority. The best bid/ask order is always at the front of
+    the list, such that matching walks the orders in priority order without
+    any lookup of price levels or scan over empty price levels.
+
+    Entries are held as `(key, sequence, limit_order)` tuples, where the key
+    is the price for asks and the negated price for bids, such that the front
+    of both lists holds the order with the highest priority. The sequence
+    number breaks ties at the same price by arrival time. As with the deque
+    books, `orders` maps order identifiers to the `LimitOrder` objects
+    resting in the book, while their entries, needed to remove them from the
+    sorted lists on cancel, are held in a private map.
+
+    Price level summaries are aggregated on the fly from the sorted lists
+    when requested.
+
+    References
+    ----------
+    . https://github.com/paritytrading/parity
+    . https://grantjenks.com/docs/sortedcontainers/sortedlist.html
+    """
+
+    def __init__(self, name: AnyStr, max_price: int) -> None:
+        super().__init__(name, max_price)
+        self._bids = SortedList()
+        self._asks = SortedList()
+        self._sequence = itertools.count()
+        self.orders = dict()
+        self._entries = dict()
+
+    def add(self, limit_order: LimitOrder) -> None:
+        """Add an order to the limit order book
+
+        Parameters
+        ----------
+        limit_order: LimitOrder
+            The limit order to add to the book
+        """
+        self._assign_order_id(limit_order)
+        is_buy = limit_order.direction == Direction.Buy
+
+        # Look for outstanding orders on the opposite side that cross with
+        # the order, i.e., with a key no greater than that of the order
+        book = self._asks if is_buy else self._bids
+        limit = limit_order.price if is_buy else -limit_order.price
+
+        while book and limit_order.quantity > 0:
+            key, _, entry = book[0]
+
+            if key > limit:
+                break
+
+            quantity = min(entry.quantity, limit_order.quantity)
+            entry.quantity -= quantity
+            limit_order.quantity -= quantity
+
+            if entry.quantity == 0:
+                # Remove existing order from book
+                del book[0]
+                del self.orders[entry.id]
+                del self._entries[entry.id]
+
+            if is_buy:
+                self._record_match(
+                    limit_order.trader_id, entry.trader_id, quantity,
+                    entry.price,
+                )
+            else:
+                self._record_match(
+                    entry.trader_id, limit_order.trader_id, quantity,
+                    entry.price,
+                )
+
+        if limit_order.quantity == 0:
+            return None
+
+        # If we get here, then there is some quantity we cannot fill, so we
+        # enqueue the order in the limit order book
+        item = (
+            -limit_order.price if is_buy else limit_order.price,
+            next(self._sequence),
+            limit_order,
+        )
+        (self._bids if is_buy else self._asks).add(item)
+        self.orders[limit_order.id] = limit_order
+        self._entries[limit_order.id] = item
+
+    def cancel(self, order_id: AnyStr) -> None:
+        """Cancel limit order with the given order identifier
+
+        Parameters
+        ----------
+        order_id: AnyStr
+            Deletes the limit order with the order identifier from the book
+        """
+        item = self._entries.pop(order_id)
+
+        if item[2].direction == Direction.Buy:
+            self._bids.remove(item)
+        else:
+            self._asks.remove(item)
+
+        del self.orders[order_id]
+
+    @property
+    def best_bid(self) -> int:
+        """The current best bid price
+
+        Returns
+        -------
+        int
+            The current best bid price
+        """
+        return -self._bids[0][0] if self._bids else 0
+
+    @property
+    def best_ask(self) -> int:
+        """The current best ask price
+
+        Returns
+        -------
+        int
+            The current best ask price
+        """
+        return self._asks[0][0] if self._asks else self.max_price
+
+    @staticmethod
+    def _levels_as_dataframe(
+            book: SortedList, levels: int) -> pandas.DataFrame:
+        """Returns a summary of the top price levels of a side of the book."""
+        prices = numpy.empty(levels, dtype=numpy.int64)
+        quantities = numpy.zeros(levels, dtype=numpy.int64)
+        num_orders = numpy.zeros(levels, dtype=numpy.int64)
+        n = 0
+
+        for _, entries in itertools.islice(
+                itertools.groupby(book, key=operator.itemgetter(0)), levels):
+            for _, _, order in entries:
+                quantities[n] += order.quantity
+                num_orders[n] += 1
+            prices[n] = order.price
+            n += 1
+
+        return pandas.DataFrame({
+            "Price": prices[:n],
+            "Quantity": quantities[:n],
+            "NumOrders": num_orders[:n],
+        })
+
+    def get_top_bids_as_dataframe(self, levels=10) -> pandas.DataFrame:
+        """Get a DataFrame summary of top bids in the order book.
+
+        Parameters
+        ----------
+        levels: int
+            The number of price levels to include in the table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas DataFrame summary of bids at the top of the book.
+        """
+        return self._levels_as_dataframe(self._bids, levels)
+
+    def get_top_asks_as_dataframe(self, levels=10) -> pandas.DataFrame:
+        """Get a DataFrame summary of top asks in the order book.
+
+        Parameters
+        ----------
+        levels: int
+            The number of price levels to include in the table.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas.DataFrame summary of asks at the top of the book.
+        """
+        return self._levels_as_dataframe(self._asks, levels)
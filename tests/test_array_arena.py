@@ -0,0 +1,135 @@
+import numpy
+import pytest
+
+from limit_order_book import (
+    ArrayArenaLimitOrderBook,
+    Direction,
+    HashDequeLimitOrderBook,
+    LimitOrder,
+)
+from limit_order_book.arena_lob import OrderArena
+
+MAX_PRICE = 200
+
+
+def random_orders(n, seed=0):
+    rng = numpy.random.default_rng(seed)
+    directions = rng.integers(0, 2, n)
+    prices = numpy.where(
+        directions == Direction.Buy.value,
+        rng.integers(90, 106, n),
+        rng.integers(95, 111, n),
+    )
+    return (
+        rng.integers(0, 10, n),
+        directions,
+        rng.integers(1, 20, n),
+        prices,
+    )
+
+
+def add_sequentially(book, trader_ids, directions, quantities, prices):
+    for trader_id, direction, quantity, price in zip(
+            trader_ids.tolist(), directions.tolist(), quantities.tolist(),
+            prices.tolist()):
+        book.add(
+            LimitOrder(trader_id, price, quantity, Direction(direction))
+        )
+
+
+def assert_same_top_of_book(book, other):
+    for levels in ("get_top_bids_as_dataframe", "get_top_asks_as_dataframe"):
+        left = getattr(book, levels)(levels=MAX_PRICE)
+        right = getattr(other, levels)(levels=MAX_PRICE)
+        assert left.values.tolist() == right.values.tolist()
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(),
+    dict(arena_capacity=4, match_buffer_size=2),
+    dict(arena_capacity=1, match_buffer_size=1, int_order_ids=True),
+])
+def test_add_batch_matches_sequential_add(kwargs):
+    orders = random_orders(2000)
+
+    expected = HashDequeLimitOrderBook("x", MAX_PRICE)
+    add_sequentially(expected, *orders)
+    expected_matches = expected.get_latest_matches(n=expected.num_matches)
+
+    book = ArrayArenaLimitOrderBook("x", MAX_PRICE, **kwargs)
+    matches = book.add_batch(*orders)
+
+    columns = ["BuyTraderId", "SellTraderId", "Quantity", "Price"]
+    assert numpy.column_stack(matches).tolist() == (
+        expected_matches[columns].values[::-1].tolist()
+    )
+    assert_same_top_of_book(book, expected)
+
+
+def test_add_matches_hash_deque():
+    orders = random_orders(2000, seed=1)
+
+    expected = HashDequeLimitOrderBook("x", MAX_PRICE)
+    add_sequentially(expected, *orders)
+
+    book = ArrayArenaLimitOrderBook("x", MAX_PRICE, arena_capacity=1)
+    add_sequentially(book, *orders)
+
+    assert book.num_matches == expected.num_matches
+    assert_same_top_of_book(book, expected)
+
+
+def test_empty_batch():
+    book = ArrayArenaLimitOrderBook("x", MAX_PRICE)
+    matches = book.add_batch([], [], [], [])
+    assert [len(column) for column in matches] == [0, 0, 0, 0]
+
+
+def test_arena_reuses_free_slots_when_full():
+    book = ArrayArenaLimitOrderBook("x", MAX_PRICE, arena_capacity=1)
+
+    # Each order is filled before the next rests, stepping across price
+    # bands, such that the single slot of the arena is always reused
+    for i in range(50):
+        price = 1 + (i * 67) % (MAX_PRICE - 1)
+        book.add(LimitOrder(1, price, 5, Direction.Sell))
+        book.add(LimitOrder(2, price, 5, Direction.Buy))
+
+    assert book.num_matches == 50
+    assert len(book._arena.qty) == 1
+
+    # The arena only grows once no slot is free
+    for price in (10, 100, 150):
+        book.add(LimitOrder(1, price, 5, Direction.Sell))
+    assert len(book._arena.qty) >= 3
+
+
+def test_shared_arena():
+    book = ArrayArenaLimitOrderBook(
+        "x", MAX_PRICE, arena_capacity=2, shared_memory=True
+    )
+
+    try:
+        book.add(LimitOrder(1, 100, 5, Direction.Sell, 0))
+        book.add(LimitOrder(1, 101, 7, Direction.Sell, 1))
+
+        view = OrderArena.attach(book.arena_name)
+        assert view.level_qty[100] == 5
+        assert view.level_qty[101] == 7
+
+        # Filled slots are reused, as a shared arena cannot grow
+        book.add(LimitOrder(2, 100, 5, Direction.Buy))
+        book.add(LimitOrder(1, 102, 3, Direction.Sell, 2))
+        assert view.level_qty[100] == 0
+        assert view.level_qty[102] == 3
+
+        with pytest.raises(MemoryError):
+            book.add(LimitOrder(1, 103, 1, Direction.Sell, 3))
+
+        view.close()
+    finally:
+        name = book.arena_name
+        book.close()
+
+    with pytest.raises(FileNotFoundError):
+        OrderArena.attach(name)
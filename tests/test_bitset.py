@@ -0,0 +1,66 @@
+import numpy
+import pytest
+
+from limit_order_book.base.bitset import (
+    clear_bit,
+    next_set_bit,
+    prev_set_bit,
+    set_bit,
+)
+
+N = 3 * 4096 + 100
+
+# Set bits either side of the word (64) and summary word (4096) boundaries
+INDICES = [1, 63, 64, 127, 4095, 4096, 4097, 8191, 8192 + 64, N - 1]
+
+
+def make_bitset(indices):
+    bits = numpy.zeros(N // 64 + 1, dtype=numpy.uint64)
+    summary = numpy.zeros(len(bits) // 64 + 1, dtype=numpy.uint64)
+    for i in indices:
+        set_bit(bits, summary, i)
+    return bits, summary
+
+
+def expected_next(indices, i):
+    return min((j for j in indices if j > i), default=N)
+
+
+def expected_prev(indices, i):
+    return max((j for j in indices if j < i), default=0)
+
+
+PROBES = sorted({
+    p for i in INDICES + [0, 62, 65, 4032, 4160, 8128, 8192, N // 2]
+    for p in (i - 1, i, i + 1) if 0 <= p < N
+})
+
+
+@pytest.mark.parametrize("i", PROBES)
+def test_next_set_bit(i):
+    bits, summary = make_bitset(INDICES)
+    assert next_set_bit(bits, summary, i, N) == expected_next(INDICES, i)
+
+
+@pytest.mark.parametrize("i", PROBES)
+def test_prev_set_bit(i):
+    bits, summary = make_bitset(INDICES)
+    assert prev_set_bit(bits, summary, i) == expected_prev(INDICES, i)
+
+
+def test_empty_bitset():
+    bits, summary = make_bitset([])
+    assert next_set_bit(bits, summary, 0, N) == N
+    assert prev_set_bit(bits, summary, N - 1) == 0
+
+
+def test_clear_bit_skips_emptied_words():
+    indices = [64, 4096, 8192]
+    bits, summary = make_bitset(indices)
+
+    # Emptying the only bit of a word clears it from the summary too
+    clear_bit(bits, summary, 4096)
+    assert summary[1] == 0
+
+    assert next_set_bit(bits, summary, 64, N) == 8192
+    assert prev_set_bit(bits, summary, 8192) == 64